@@ -0,0 +1,96 @@
+"""
+Serialization throughput of the order list on 100k orders.
+
+Compares loading ORM objects and calling serialize() against serializing
+the column tuples of ORDER_ROW_COLUMNS, each encoded with the default and
+the orjson JSON provider.
+
+Usage:
+    python benchmarks/bench_serialization.py [--orders 100000] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from json_provider import OrjsonProvider, orjson
+from models import ORDER_ROW_COLUMNS, Order, Product, db, serialize_order_row
+
+
+def create_app(orders: int) -> Flask:
+    """Create an app on an in-memory database seeded with orders."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(Product), [
+            {'name': f'Product {i}', 'brand': 'Bench', 'price': 9.99, 'stock': 10}
+            for i in range(100)
+        ])
+        db.session.execute(db.insert(Order), [
+            {'product_id': i % 100 + 1, 'quantity': 1, 'customer': f'Customer {i}',
+             'order_date': date(2024, 1, 1), 'status': 'open'}
+            for i in range(orders)
+        ])
+        db.session.commit()
+
+    return app
+
+def load_orm() -> List[Dict[str, Any]]:
+    """Serialize the orders through ORM objects."""
+    orders = db.session.scalars(db.select(Order).order_by(Order.id)).unique()
+    return [order.serialize() for order in orders]
+
+def load_rows() -> List[Dict[str, Any]]:
+    """Serialize the orders straight from column tuples."""
+    statement = db.select(*ORDER_ROW_COLUMNS).join(Order.product).order_by(Order.id)
+    return [serialize_order_row(row) for row in db.session.execute(statement)]
+
+def measure(load: Callable[[], List[Dict[str, Any]]], dumps: Callable[[Any], Any],
+            repeat: int) -> Dict[str, float]:
+    """Return the best load and encode time over ``repeat`` runs, in seconds."""
+    best = {'load': float('inf'), 'encode': float('inf')}
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        data = load()
+        loaded = time.perf_counter()
+        dumps(data)
+        encoded = time.perf_counter()
+        best['load'] = min(best['load'], loaded - start)
+        best['encode'] = min(best['encode'], encoded - loaded)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_app(args.orders)
+    providers: Dict[str, Any] = {'default': DefaultJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+
+    print(f"{'rows':<5} {'json':<8} {'load s':>8} {'encode s':>9} "
+          f"{'total s':>8} {'orders/s':>10}")
+    with app.app_context():
+        for rows, load in (('orm', load_orm), ('tuple', load_rows)):
+            for name, provider in providers.items():
+                result = measure(load, provider.dumps, args.repeat)
+                total = result['load'] + result['encode']
+                print(f"{rows:<5} {name:<8} {result['load']:>8.3f} "
+                      f"{result['encode']:>9.3f} {total:>8.3f} "
+                      f"{args.orders / total:>10.0f}")
+
+if __name__ == "__main__":
+    main()
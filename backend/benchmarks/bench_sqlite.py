@@ -0,0 +1,136 @@
+"""
+Mixed read/write benchmark of the default and the tuned SQLite profile.
+
+Reader threads page through GET /api/orders while writer threads create
+orders with POST /api/orders, both against a fresh file database.
+
+Usage:
+    python benchmarks/bench_sqlite.py [--seconds 5] [--readers 8] [--writers 4]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List
+
+from flask import Flask
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from database import (
+    DEFAULT_ENGINE_OPTIONS,
+    DEFAULT_SQLITE_PRAGMAS,
+    enable_sqlite_pragmas,
+)
+from models import Order, Product, db
+from routes import bp
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {'pragmas': {}, 'engine_options': {}},
+    'tuned': {
+        'pragmas': DEFAULT_SQLITE_PRAGMAS,
+        'engine_options': DEFAULT_ENGINE_OPTIONS,
+    },
+}
+
+
+def create_app(db_path: str, profile: Dict[str, Any]) -> Flask:
+    """Create an app on a database seeded with a product and 1,000 orders."""
+    app = Flask(__name__)
+    app.config.update({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SQLALCHEMY_ENGINE_OPTIONS': profile['engine_options'],
+    })
+    db.init_app(app)
+    app.register_blueprint(bp, url_prefix='/api')
+
+    with app.app_context():
+        enable_sqlite_pragmas(db.engine, profile['pragmas'])
+        db.create_all()
+        product = Product(name='Bench', brand='Bench', price=1.0, stock=10**9)
+        db.session.add(product)
+        db.session.flush()
+        db.session.add_all(
+            Order(product_id=product.id, quantity=1, customer=f'Customer {i}',
+                  order_date=date(2024, 1, 1))
+            for i in range(1000)
+        )
+        db.session.commit()
+
+    return app
+
+def run(app: Flask, seconds: float, readers: int, writers: int) -> Dict[str, Any]:
+    """Run the mixed workload and collect latencies per kind of request."""
+    latencies: Dict[str, List[float]] = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(kind: str) -> None:
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if kind == 'read':
+                response = client.get('/api/orders?limit=50')
+            else:
+                response = client.post('/api/orders', json={
+                    'product_id': 1,
+                    'quantity': 1,
+                    'customer': 'Bench',
+                    'order_date': '2024-01-01',
+                })
+            elapsed = time.perf_counter() - start
+            with lock:
+                if response.status_code >= 400:
+                    errors[kind] += 1
+                else:
+                    latencies[kind].append(elapsed)
+
+    threads = (
+        [threading.Thread(target=worker, args=('read',)) for _ in range(readers)]
+        + [threading.Thread(target=worker, args=('write',)) for _ in range(writers)]
+    )
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        kind: {
+            'ops': len(values) / seconds,
+            'p50': statistics.median(values) * 1000 if values else 0.0,
+            'p95': (statistics.quantiles(values, n=20)[-1] * 1000
+                    if len(values) > 1 else 0.0),
+            'errors': errors[kind],
+        }
+        for kind, values in latencies.items()
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'profile':<8} {'kind':<6} {'ops/s':>8} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'errors':>7}")
+    for name, profile in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app(os.path.join(tmp, 'bench.db'), profile)
+            results = run(app, args.seconds, args.readers, args.writers)
+            with app.app_context():
+                db.engine.dispose()
+
+        for kind, result in results.items():
+            print(f"{name:<8} {kind:<6} {result['ops']:>8.1f} "
+                  f"{result['p50']:>8.2f} {result['p95']:>8.2f} "
+                  f"{result['errors']:>7}")
+
+if __name__ == "__main__":
+    main()
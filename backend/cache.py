@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache with LRU and TTL eviction.
+
+    Entries expire ``ttl`` seconds after they were stored, and once the
+    cache holds ``max_size`` entries, storing another one evicts the least
+    recently used entry. All methods may be called from any thread.
+
+    Every worker process has its own cache, so it must only hold values
+    that are keyed on something every write changes, like a table version,
+    or that are invalidated by the process which wrote.
+    """
+    def __init__(self, max_size: int = 128, ttl: float = 300.0):
+        """
+        Args:
+            max_size (int): Maximum number of entries.
+            ttl (float): Lifetime of an entry in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key (hashable): Cache key.
+
+        Returns:
+            any: The cached value, None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if needed.
+
+        Args:
+            key (hashable): Cache key.
+            value (any): Value to cache. It is shared with every later
+                reader, so it must not be modified afterwards.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries, keeping the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache statistics.
+
+        Returns:
+            dict: Hits, misses, hit ratio, current size and settings.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+            }
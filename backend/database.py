@@ -0,0 +1,59 @@
+from typing import Any, Dict
+
+from sqlalchemy import Engine, event, make_url
+
+# Pragmas applied to every new SQLite connection. WAL lets readers run
+# while a write is in progress, and synchronous=NORMAL is durable in WAL
+# mode except for the last transactions before a power loss.
+DEFAULT_SQLITE_PRAGMAS: Dict[str, Any] = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,      # in KiB, i.e. 64 MiB per connection
+    'mmap_size': 268435456,    # 256 MiB
+    'busy_timeout': 5000,      # in milliseconds
+    'foreign_keys': 'ON',
+}
+
+DEFAULT_ENGINE_OPTIONS: Dict[str, Any] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30,
+}
+
+
+def default_engine_options(database_uri: str) -> Dict[str, Any]:
+    """
+    Get the default engine options for a database.
+
+    In-memory SQLite databases live on a single static connection, so the
+    pool settings only apply to file databases.
+
+    Args:
+        database_uri (str): SQLAlchemy database URI.
+
+    Returns:
+        dict: Engine options.
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+
+    return dict(DEFAULT_ENGINE_OPTIONS)
+
+def enable_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Apply pragmas to every connection the engine opens.
+
+    Args:
+        engine (Engine): SQLite engine.
+        pragmas (dict): Pragma values by name.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
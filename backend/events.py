@@ -0,0 +1,74 @@
+import threading
+from typing import Optional
+
+
+class ChangeNotifier:
+    """
+    Wakes up the event streams of this process when a write is committed.
+
+    Writes made by other worker processes do not reach the notifier, so
+    streams also poll the table versions; the notifier only makes changes
+    made in this process show up without waiting for the next poll.
+    """
+    def __init__(self):
+        self.revision = 0
+        self._condition = threading.Condition()
+
+    def notify(self, revision: int) -> None:
+        """
+        Announce a committed write.
+
+        Args:
+            revision (int): Revision of the write.
+        """
+        with self._condition:
+            self.revision = max(self.revision, revision)
+            self._condition.notify_all()
+
+    def wait(self, revision: int, timeout: Optional[float]) -> bool:
+        """
+        Wait until a write after a revision is announced.
+
+        Args:
+            revision (int): Last revision the caller has seen.
+            timeout (float): Maximum time to wait in seconds.
+
+        Returns:
+            bool: True if a newer revision was announced, False on timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self.revision > revision, timeout
+            )
+
+class StreamSlots:
+    """
+    Counts the event streams open in this process, up to a limit.
+
+    Every stream holds a worker thread for as long as it is open, so the
+    number of streams is capped to leave threads for the other requests.
+    """
+    def __init__(self):
+        self.open = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, limit: int) -> bool:
+        """
+        Take a slot for a new stream.
+
+        Args:
+            limit (int): Maximum number of open streams.
+
+        Returns:
+            bool: True if a slot was taken, False if all are in use.
+        """
+        with self._lock:
+            if self.open >= limit:
+                return False
+            self.open += 1
+            return True
+
+    def release(self) -> None:
+        """Give back the slot of a closed stream."""
+        with self._lock:
+            self.open -= 1
@@ -0,0 +1,47 @@
+"""
+Gunicorn settings for serving the API in production.
+
+Run with:
+    gunicorn --config gunicorn.conf.py 'server:create_app()'
+
+Every setting can be overridden through the environment variables below.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Worker processes handle requests in parallel, the threads of each worker
+# overlap the time spent waiting on SQLite and the network.
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_class = 'gthread'
+
+# Every open /api/events stream holds a thread of its worker, so each
+# worker serves at most MAX_EVENT_STREAMS streams (default: half of its
+# threads) and refuses more with a 503. The other threads stay free for
+# the rest of the API. Size workers * MAX_EVENT_STREAMS for the number of
+# desktop clients connected at once.
+os.environ.setdefault('MAX_EVENT_STREAMS', str(max(1, threads // 2)))
+
+# On SIGTERM workers finish their in-flight requests for up to
+# graceful_timeout seconds before they are killed.
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('WORKER_TIMEOUT', 60))
+keepalive = int(os.environ.get('KEEPALIVE', 5))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Create and migrate the database once, before the workers are forked."""
+    from models import db
+    from server import create_app
+
+    # Every worker creates its own app, so close the connections opened
+    # here instead of inheriting them across the fork.
+    app = create_app()
+    with app.app_context():
+        db.engine.dispose()
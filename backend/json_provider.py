@@ -0,0 +1,98 @@
+from typing import Any, Union
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding with orjson.
+
+    The output is equivalent to :class:`DefaultJSONProvider`, except that
+    non-ASCII characters are written as UTF-8 instead of escapes: keys are
+    sorted unless ``sort_keys`` is disabled, responses are indented in
+    debug mode, and types orjson does not encode the same way (dates,
+    decimals, ...) are passed to the default provider's ``default``.
+    """
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON.
+
+        Args:
+            obj (any): Data to serialize.
+            **kwargs: Arguments of :func:`json.dumps`. Anything orjson cannot
+                honour falls back to the default provider.
+
+        Returns:
+            str: The JSON document.
+        """
+        indent = kwargs.get('indent')
+        if set(kwargs) - {'indent', 'separators'} or indent not in (None, 2):
+            return super().dumps(obj, **kwargs)
+
+        return self._encode(obj, indent=indent is not None).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """
+        Deserialize data as JSON.
+
+        Args:
+            s (str | bytes): The JSON document.
+            **kwargs: Arguments of :func:`json.loads`, which make it fall
+                back to the default provider.
+
+        Returns:
+            any: The decoded data.
+        """
+        if kwargs:
+            return super().loads(s, **kwargs)
+
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """
+        Serialize the arguments as a JSON response.
+
+        Unlike the default provider, the encoded bytes are passed to the
+        response as they are, without a round trip through ``str``.
+
+        Returns:
+            Response: The JSON response.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        return self._app.response_class(
+            self._encode(obj, indent) + b'\n', mimetype=self.mimetype
+        )
+
+    def _encode(self, obj: Any, indent: bool) -> bytes:
+        """Encode data with the options matching the provider settings."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(obj, default=self.default, option=option)
+
+def create_json_provider(app: Flask) -> JSONProvider:
+    """
+    Create the fastest JSON provider available for the app.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        JSONProvider: An :class:`OrjsonProvider` if orjson is installed,
+            the default provider otherwise.
+    """
+    if orjson is None:
+        return DefaultJSONProvider(app)
+
+    return OrjsonProvider(app)
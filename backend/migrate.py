@@ -0,0 +1,176 @@
+import os
+import sys
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from models import Order, db
+from sqlalchemy import Engine, create_engine, text
+
+# Formats accepted for legacy free-form order dates, tried in order after
+# ISO 8601.
+LEGACY_DATE_FORMATS = ['%d.%m.%Y', '%Y/%m/%d', '%d/%m/%Y']
+
+
+def add_missing_columns(engine: Engine) -> List[str]:
+    """
+    Add columns that were added to the models after their tables were created.
+
+    ``create_all()`` only creates missing tables, so new columns of existing
+    tables are added here with ALTER TABLE. Such columns must be nullable
+    or have a server default, which existing rows get as their value.
+
+    Args:
+        engine (Engine): Engine of the SQLite database to migrate.
+
+    Returns:
+        list: The added columns as ``table.column``.
+    """
+    added: List[str] = []
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {
+                row.name
+                for row in conn.execute(text(f'PRAGMA table_info("{table.name}")'))
+            }
+            if not existing:
+                continue
+
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+
+                ddl = (
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" '
+                    f'{column.type.compile(dialect=engine.dialect)}'
+                )
+                if not column.nullable:
+                    ddl += ' NOT NULL'
+                if column.server_default is not None:
+                    ddl += f" DEFAULT '{column.server_default.arg}'"
+
+                conn.execute(text(ddl))
+                added.append(f'{table.name}.{column.name}')
+
+    return added
+
+def migrate_order_dates(engine: Engine) -> int:
+    """
+    Convert the order date column from free-form text to a DATE column.
+
+    Existing values are normalized to ISO 8601 and the order table is
+    rebuilt from the current model, including its indexes, inside a single
+    transaction. Databases that are already migrated are left untouched.
+
+    Args:
+        engine (Engine): Engine of the SQLite database to migrate.
+
+    Returns:
+        int: Number of migrated orders, 0 if nothing had to be done.
+
+    Raises:
+        ValueError: If an existing order date cannot be parsed. Nothing is
+            changed in that case.
+    """
+    table = Order.__table__
+    name = table.name
+
+    with engine.connect() as conn:
+        columns = {
+            row.name: row.type
+            for row in conn.execute(text(f'PRAGMA table_info("{name}")'))
+        }
+        if columns.get('order_date', 'DATE').upper() == 'DATE':
+            return 0
+
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                text(f'SELECT id, order_date FROM "{name}"')
+            ).all()
+
+            updates: List[Dict[str, Any]] = []
+            invalid: List[int] = []
+            for order_id, value in rows:
+                parsed = parse_legacy_date(value)
+                if parsed is None:
+                    invalid.append(order_id)
+                elif parsed.isoformat() != value:
+                    updates.append({'id': order_id, 'value': parsed.isoformat()})
+
+            if invalid:
+                raise ValueError(
+                    f"Unparseable order dates for orders: "
+                    f"{', '.join(map(str, invalid))}"
+                )
+
+            if updates:
+                conn.execute(
+                    text(
+                        f'UPDATE "{name}" SET order_date = :value '
+                        f'WHERE id = :id'
+                    ),
+                    updates
+                )
+
+            legacy_name = f'{name}_legacy'
+            for index in table.indexes:
+                conn.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+            conn.execute(text(f'ALTER TABLE "{name}" RENAME TO "{legacy_name}"'))
+
+            table.create(conn)
+
+            # Columns missing from the legacy table keep their defaults.
+            column_list = ', '.join(
+                f'"{column.name}"' for column in table.columns
+                if column.name in columns
+            )
+            conn.execute(text(
+                f'INSERT INTO "{name}" ({column_list}) '
+                f'SELECT {column_list} FROM "{legacy_name}"'
+            ))
+            conn.execute(text(f'DROP TABLE "{legacy_name}"'))
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return len(rows)
+
+def parse_legacy_date(value: Any) -> Optional[date]:
+    """
+    Parse a legacy order date.
+
+    Args:
+        value (any): Stored order date.
+
+    Returns:
+        date: The parsed date, None if the value cannot be parsed.
+    """
+    if not isinstance(value, str):
+        return None
+
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        pass
+
+    for date_format in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+
+    return None
+
+if __name__ == "__main__":
+    db_path = (
+        sys.argv[1] if len(sys.argv) > 1
+        else os.path.join(os.path.dirname(__file__), 'instance', 'order_manager.db')
+    )
+    engine = create_engine(f'sqlite:///{db_path}')
+    for column in add_missing_columns(engine):
+        print(f"Added column {column}")
+    count = migrate_order_dates(engine)
+    print(f"Migrated {count} orders" if count else "No order dates to migrate")
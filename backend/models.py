@@ -1,4 +1,8 @@
+from datetime import date
+from typing import Any, Dict, Sequence
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert_sentinel, type_coerce
 
 db = SQLAlchemy()
 
@@ -9,6 +13,14 @@ class Product(db.Model):
     brand: str = db.Column(db.String(100), nullable=False)
     price: float = db.Column(db.Float, nullable=False)
     stock: int = db.Column(db.Integer, nullable=False)
+    # Revision of the last write to the row, see TableVersion.
+    revision: int = db.Column(
+        db.Integer, nullable=False, default=0, server_default='0', index=True
+    )
+    # Lets multi-row INSERTs return the new IDs in the order of their rows,
+    # which SQLite's autoincrement IDs alone do not guarantee, see
+    # routes.insert_many().
+    _sentinel = insert_sentinel('_sentinel')
 
     def serialize(self):
         """Return object data in serializeable format."""
@@ -23,16 +35,47 @@ class Product(db.Model):
     def __repr__(self):
         return f'<Product {self.id}>'
 
+# Case-insensitive indexes for the prefix search of the products, which
+# SQLite uses for ``LIKE 'prefix%'`` as LIKE ignores the case of ASCII.
+db.Index('ix_product_name', Product.name.collate('NOCASE'))
+db.Index('ix_product_brand', Product.brand.collate('NOCASE'))
+
 class Order(db.Model):
     """Order model."""
+    # Keyset pages are ordered by (sort column, id), so the filter columns
+    # are followed by the sort column and id. SQLite then reads a page off
+    # the index instead of sorting all matching orders first. Date ranges,
+    # and statuses or products sorted by customer or status, still sort
+    # their matches.
+    __table_args__ = (
+        db.Index('ix_order_customer_id', 'customer', 'id'),
+        db.Index('ix_order_customer_status', 'customer', 'status', 'id'),
+        db.Index('ix_order_customer_order_date', 'customer', 'order_date', 'id'),
+        db.Index('ix_order_status_id', 'status', 'id'),
+        db.Index('ix_order_status_order_date', 'status', 'order_date', 'id'),
+        db.Index('ix_order_product_id_id', 'product_id', 'id'),
+        db.Index('ix_order_product_id_order_date', 'product_id', 'order_date', 'id'),
+        db.Index('ix_order_order_date', 'order_date', 'id'),
+    )
+
     id: int = db.Column(db.Integer, primary_key=True)
     product_id: int = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
     quantity: int = db.Column(db.Integer, nullable=False)
     customer: str = db.Column(db.String(100), nullable=False)
-    order_date: str = db.Column(db.String(100), nullable=False)
+    order_date: date = db.Column(db.Date, nullable=False)
     status: str = db.Column(db.String(20), default="open")
+    # Revision of the last write to the row, see TableVersion.
+    revision: int = db.Column(
+        db.Integer, nullable=False, default=0, server_default='0', index=True
+    )
+    # Lets multi-row INSERTs return the new IDs in the order of their rows,
+    # which SQLite's autoincrement IDs alone do not guarantee, see
+    # routes.insert_many().
+    _sentinel = insert_sentinel('_sentinel')
 
-    product = db.relationship('Product', backref='orders')
+    # Every serialized order embeds its product, so load it in the same
+    # SELECT instead of issuing one lazy query per order.
+    product = db.relationship('Product', backref='orders', lazy='joined')
 
     def serialize(self):
         """Return object data in serializeable format."""
@@ -41,9 +84,86 @@ class Order(db.Model):
             'product': self.product.serialize(),
             'quantity': self.quantity,
             'customer': self.customer,
-            'order_date': self.order_date,
+            'order_date': self.order_date.isoformat(),
             'status': self.status
         }
 
     def __repr__(self):
         return f'<Order {self.id}>'
+
+class TableVersion(db.Model):
+    """
+    Version of a table, bumped by every write to the table.
+
+    The row named REVISION counts all write transactions. Every row written
+    by a transaction and every Tombstone it leaves is stamped with its
+    revision, so clients can ask for everything after the last revision
+    they have seen.
+    """
+    REVISION = 'revision'
+
+    name: str = db.Column(db.String(50), primary_key=True)
+    version: int = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<TableVersion {self.name} {self.version}>'
+
+class Tombstone(db.Model):
+    """Deleted row, kept so delta syncs can report the deletion."""
+    id: int = db.Column(db.Integer, primary_key=True)
+    table_name: str = db.Column(db.String(50), nullable=False)
+    row_id: int = db.Column(db.Integer, nullable=False)
+    revision: int = db.Column(db.Integer, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<Tombstone {self.table_name} {self.row_id}>'
+
+# Columns read by the list endpoints. Serializing these rows directly skips
+# building ORM objects and produces the same data as serialize().
+PRODUCT_ROW_COLUMNS = (
+    Product.id, Product.name, Product.brand, Product.price, Product.stock
+)
+ORDER_ROW_COLUMNS = (
+    Order.id,
+    Order.quantity,
+    Order.customer,
+    # SQLite stores dates as ISO 8601 text, so read it as is instead of
+    # parsing it into a date only to format it again.
+    type_coerce(Order.order_date, db.String).label('order_date'),
+    Order.status,
+    Order.product_id,
+    Product.name,
+    Product.brand,
+    Product.price,
+    Product.stock,
+)
+
+def serialize_product_row(row: Sequence[Any]) -> Dict[str, Any]:
+    """Serialize a row of PRODUCT_ROW_COLUMNS like Product.serialize()."""
+    product_id, name, brand, price, stock = row
+    return {
+        'id': product_id,
+        'name': name,
+        'brand': brand,
+        'price': price,
+        'stock': stock
+    }
+
+def serialize_order_row(row: Sequence[Any]) -> Dict[str, Any]:
+    """Serialize a row of ORDER_ROW_COLUMNS like Order.serialize()."""
+    (order_id, quantity, customer, order_date, status,
+     product_id, name, brand, price, stock) = row
+    return {
+        'id': order_id,
+        'product': {
+            'id': product_id,
+            'name': name,
+            'brand': brand,
+            'price': price,
+            'stock': stock
+        },
+        'quantity': quantity,
+        'customer': customer,
+        'order_date': order_date,
+        'status': status
+    }
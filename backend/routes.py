@@ -1,39 +1,287 @@
+import base64
+import csv
+import hashlib
+import io
+import json
+import time
+from datetime import date, datetime
 from http import HTTPStatus
-from typing import Any, Dict, List
-
-from flask import Blueprint, current_app, jsonify, request
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cache import LRUCache
+from events import ChangeNotifier, StreamSlots
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
+from flask.blueprints import BlueprintSetupState
 from flask.typing import ResponseReturnValue
-from models import Order, Product, db
+from models import (
+    ORDER_ROW_COLUMNS,
+    PRODUCT_ROW_COLUMNS,
+    Order,
+    Product,
+    TableVersion,
+    Tombstone,
+    db,
+    serialize_order_row,
+    serialize_product_row,
+)
+from sqlalchemy import bindparam, delete, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from werkzeug.http import quote_etag
 
 bp = Blueprint('api', __name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BULK_SIZE = 10000
+EXPORT_BATCH_SIZE = 1000
+PRODUCT_CACHE_SIZE = 64
+PRODUCT_CACHE_TTL = 300
+# Default number of products returned by a product search.
+PRODUCT_SEARCH_LIMIT = 20
+
+SYNC_TABLES = ['products', 'orders']
+# Database table of every sync table name.
+SYNC_TABLE_NAMES = {
+    'products': Product.__tablename__,
+    'orders': Order.__tablename__,
+}
+
+# Event streams end after EVENT_STREAM_DURATION seconds, well within the
+# graceful shutdown timeout, and clients reconnect after EVENT_RETRY
+# milliseconds. Writes of other worker processes are picked up by polling
+# every EVENT_POLL_INTERVAL seconds.
+EVENT_STREAM_DURATION = 25
+EVENT_POLL_INTERVAL = 2
+EVENT_RETRY = 1000
+# Event streams open at once per worker process. Every stream holds one
+# worker thread, so this must stay below the threads per worker, see
+# gunicorn.conf.py. Further clients get a 503 and retry after
+# EVENT_BUSY_RETRY seconds.
+MAX_EVENT_STREAMS = 2
+EVENT_BUSY_RETRY = 10
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+PRODUCT_FIELDS = ['name', 'brand', 'price', 'stock']
+ORDER_FIELDS = ['product_id', 'quantity', 'customer', 'order_date']
+# Maximum length of an order status, the size of its column.
+STATUS_LENGTH = Order.status.type.length
+
+# CSV header of an order export, in the order of ORDER_ROW_COLUMNS.
+ORDER_EXPORT_FIELDS = [
+    'id', 'quantity', 'customer', 'order_date', 'status', 'product_id',
+    'product_name', 'product_brand', 'product_price', 'product_stock'
+]
+
+ORDER_SORT_KEYS = {
+    'id': Order.id,
+    'customer': Order.customer,
+    'order_date': Order.order_date,
+    'status': Order.status,
+}
+
+@bp.record_once
+def init_product_cache(state: BlueprintSetupState) -> None:
+    """
+    Create the product cache of the app the blueprint is registered on.
+
+    The cache holds serialized product lists and pages by ETag. The ETag
+    covers the product table version, so entries written by another worker
+    are never served stale; writes in this process also clear the cache
+    right away. Its size and TTL are set with PRODUCT_CACHE_SIZE and
+    PRODUCT_CACHE_TTL.
+    """
+    config = state.app.config
+    state.app.extensions['product_cache'] = LRUCache(
+        config.get('PRODUCT_CACHE_SIZE', PRODUCT_CACHE_SIZE),
+        config.get('PRODUCT_CACHE_TTL', PRODUCT_CACHE_TTL)
+    )
+
+@bp.record_once
+def init_change_notifier(state: BlueprintSetupState) -> None:
+    """Create the change notifier of the app the blueprint is registered on."""
+    state.app.extensions['change_notifier'] = ChangeNotifier()
+
+@bp.record_once
+def init_stream_slots(state: BlueprintSetupState) -> None:
+    """Create the event stream slots of the app the blueprint is registered on."""
+    state.app.extensions['stream_slots'] = StreamSlots()
+
 # Routes for products
 @bp.route('/products', methods=['GET'])
 def get_products() -> ResponseReturnValue:
     """
     Get all products.
 
+    When ``limit`` or ``after`` is given, a single page of products is
+    returned instead, see :func:`paginate`. The response carries an ETag,
+    see :func:`table_etag`, and a matching ``If-None-Match`` gets an empty
+    304 response.
+
     Returns:
         ResponseReturnValue:
             JSON response containing list of products and HTTP status code.
-            Success: (product_list, 200)
-            Error: (error_message, 500)
+            Success: (product_list, 200), (product_page, 200) or ('', 304)
+            Error: (error_message, 400) or (error_message, 500)
+
+    Raises:
+        ValueError: If the pagination parameters are invalid.
+        Exception: If database query fails
+    """
+    try:
+        etag = table_etag(Product)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+
+        products = product_cache().get(etag)
+        if products is None:
+            statement = select(*PRODUCT_ROW_COLUMNS)
+            if is_paginated_request():
+                products = paginate(statement, [Product.id], serialize_product_row)
+            else:
+                products = [
+                    serialize_product_row(row)
+                    for row in db.session.execute(statement.order_by(Product.id))
+                ]
+            product_cache().set(etag, products)
+
+        if isinstance(products, dict):
+            current_app.logger.info(
+                f"Retrieved page of {len(products['items'])} products"
+            )
+        else:
+            current_app.logger.info(f"Retrieved {len(products)} products")
+
+        return create_response(products, HTTPStatus.OK, {'ETag': quote_etag(etag)})
+    except ValueError as e:
+        current_app.logger.error(f"Invalid product query: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        current_app.logger.error(f"Error fetching products: {str(e)}")
+        return create_response({
+            "message": "Error fetching products",
+            "error": str(e)
+        }, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+@bp.route('/products/search', methods=['GET'])
+def search_products() -> ResponseReturnValue:
+    """
+    Search products by the start of their name or brand.
+
+    ``q`` is the prefix, matched ignoring the case of ASCII letters, and
+    ``limit`` the maximum number of products (default
+    PRODUCT_SEARCH_LIMIT). The products are ordered by name. The prefix is
+    looked up in the case-insensitive indexes of both columns, so only the
+    matching products are read rather than the whole table. All of them are
+    sorted before the limit applies, so a short prefix that matches many
+    products costs more than a long one. The response carries an ETag, see
+    :func:`table_etag`.
+
+    Returns:
+        ResponseReturnValue:
+            JSON response containing list of products and HTTP status code.
+            Success: (product_list, 200) or ('', 304)
+            Error: (error_message, 400) or (error_message, 500)
+
+    Raises:
+        ValueError: If the prefix is missing or the limit is invalid.
+        Exception: If database query fails
+    """
+    try:
+        prefix = request.args.get('q', '')
+        if not prefix:
+            raise ValueError("Missing search prefix q")
+        limit = (
+            parse_limit(request.args['limit'])
+            if 'limit' in request.args else PRODUCT_SEARCH_LIMIT
+        )
+
+        etag = table_etag(Product)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+
+        # LIKE, unlike ilike(), can use the NOCASE indexes.
+        pattern = f'{escape_like(prefix)}%'
+        statement = (
+            select(*PRODUCT_ROW_COLUMNS)
+            .where(or_(
+                Product.name.like(pattern, escape='\\'),
+                Product.brand.like(pattern, escape='\\')
+            ))
+            .order_by(Product.name.collate('NOCASE'), Product.id)
+            .limit(limit)
+        )
+        products = [
+            serialize_product_row(row) for row in db.session.execute(statement)
+        ]
+        current_app.logger.info(
+            f"Found {len(products)} products starting with {prefix!r}"
+        )
+
+        return create_response(products, HTTPStatus.OK, {'ETag': quote_etag(etag)})
+    except ValueError as e:
+        current_app.logger.error(f"Invalid product search: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        current_app.logger.error(f"Error searching products: {str(e)}")
+        return create_response({
+            "message": "Error searching products",
+            "error": str(e)
+        }, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+@bp.route('/products/<int:product_id>', methods=['GET'])
+def get_product(product_id: int) -> ResponseReturnValue:
+    """
+    Get a product.
+
+    The response carries an ETag like the product list, see
+    :func:`table_etag`, and a matching ``If-None-Match`` gets an empty 304
+    response.
+
+    Args:
+        product_id (int): Product ID.
+
+    Returns:
+        ResponseReturnValue:
+            JSON response containing the product and HTTP status code.
+            Success: (product, 200) or ('', 304)
+            Error: (error_message, 404) or (error_message, 500)
 
     Raises:
         Exception: If database query fails
     """
     try:
-        products: List[Product] = Product.query.all()
-        current_app.logger.info(f"Retrieved {len(products)} products")
+        etag = table_etag(Product)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+
+        row = db.session.execute(
+            select(*PRODUCT_ROW_COLUMNS).where(Product.id == product_id)
+        ).first()
+        if row is None:
+            return create_response({
+                "message": f"Product with ID {product_id} not found"
+            }, HTTPStatus.NOT_FOUND)
+
+        current_app.logger.info(f"Retrieved product #{product_id}")
 
         return create_response(
-            [product.serialize() for product in products],
-            HTTPStatus.OK
+            serialize_product_row(row), HTTPStatus.OK, {'ETag': quote_etag(etag)}
         )
     except Exception as e:
-        current_app.logger.error(f"Error fetching products: {str(e)}")
+        current_app.logger.error(f"Error fetching product: {str(e)}")
         return create_response({
-            "message": "Error fetching products",
+            "message": "Error fetching product",
             "error": str(e)
         }, HTTPStatus.INTERNAL_SERVER_ERROR)
 
@@ -52,17 +300,10 @@ def create_product() -> ResponseReturnValue:
     try:
         data: Dict[str, Any] = request.json or {}
 
-        validate_request_data(data, ['name', 'brand', 'price', 'stock'])
-
-        if data.get('price', 0) <= 0:
-            raise ValueError("Price must be greater than 0")
-
-        if data.get('stock', 0) < 0:
-            raise ValueError("Stock must be greater than or equal to 0")
-
-        product = Product(**data)
+        product = Product(**validate_product_data(data))
+        revision = product.revision = bump_table_versions(Product)
         db.session.add(product)
-        db.session.commit()
+        commit_changes(revision, Product)
 
         current_app.logger.info(f"Created product #{product.id} - {product.name}")
 
@@ -102,8 +343,9 @@ def update_product(product_id: int) -> ResponseReturnValue:
 
         for key, value in data.items():
             setattr(product, key, value)
+        revision = product.revision = bump_table_versions(Product)
 
-        db.session.commit()
+        commit_changes(revision, Product)
 
         current_app.logger.info(f"Updated product #{product.id} - {product.name}")
 
@@ -137,7 +379,9 @@ def delete_product(product_id: int) -> ResponseReturnValue:
             raise ValueError(f"Product with ID {product_id} not found")
 
         db.session.delete(product)
-        db.session.commit()
+        revision = bump_table_versions(Product)
+        add_tombstones(Product, [product.id], revision)
+        commit_changes(revision, Product)
 
         current_app.logger.info(f"Deleted product #{product.id} - {product.name}")
 
@@ -151,27 +395,179 @@ def delete_product(product_id: int) -> ResponseReturnValue:
             "message": "Internal server error"
         }, HTTPStatus.INTERNAL_SERVER_ERROR)
 
+@bp.route('/products/bulk', methods=['POST'])
+def bulk_products() -> ResponseReturnValue:
+    """
+    Create, update and delete many products in a single transaction.
+
+    The request body may contain ``create`` (list of products), ``update``
+    (list of products including their ``id``) and ``delete`` (list of
+    product IDs). All items are validated up front; if any of them is
+    invalid, nothing is written and the errors are reported per item.
+
+    Returns:
+        tuple: A tuple containing the response data and status code.
+            Success: ({"created": [...], "updated": [...], "deleted": [...]}, 200)
+            Error: ({"message": ..., "errors": [...]}, 400) or
+                (error_message, 500)
+
+    Raises:
+        BulkValidationError: If any item of the batch is invalid.
+        ValueError: If the JSON is invalid.
+        Exception: If an error occurs while applying the batch.
+    """
+    try:
+        creates, updates, deletes = parse_bulk_request(request.json)
+        errors: List[Dict[str, Any]] = []
+
+        new_rows: List[Dict[str, Any]] = []
+        for index, item in enumerate(creates):
+            try:
+                new_rows.append(validate_product_data(item))
+            except ValueError as e:
+                errors.append(bulk_error('create', index, e))
+
+        changed_rows: Dict[int, Dict[str, Any]] = {}
+        for index, item in enumerate(updates):
+            try:
+                changed_rows[index] = {
+                    'id': validate_id(item),
+                    **validate_product_data(item)
+                }
+            except ValueError as e:
+                errors.append(bulk_error('update', index, e))
+
+        existing_ids = set(db.session.scalars(
+            select(Product.id).where(Product.id.in_(
+                [row['id'] for row in changed_rows.values()] + deletes
+            ))
+        ))
+        referenced_ids = set(db.session.scalars(
+            select(Order.product_id).distinct().where(
+                Order.product_id.in_(deletes)
+            )
+        )) if deletes else set()
+
+        for index, row in changed_rows.items():
+            if row['id'] not in existing_ids:
+                errors.append(bulk_error(
+                    'update', index, f"Product with ID {row['id']} not found"
+                ))
+
+        for index, product_id in enumerate(deletes):
+            if product_id not in existing_ids:
+                errors.append(bulk_error(
+                    'delete', index, f"Product with ID {product_id} not found"
+                ))
+            elif product_id in referenced_ids:
+                errors.append(bulk_error(
+                    'delete', index, f"Product with ID {product_id} has orders"
+                ))
+
+        if errors:
+            raise BulkValidationError(errors)
+
+        revision = bump_table_versions(Product)
+        for row in new_rows + list(changed_rows.values()):
+            row['revision'] = revision
+
+        created_ids = insert_many(Product, new_rows)
+        if changed_rows:
+            db.session.execute(update(Product), list(changed_rows.values()))
+        if deletes:
+            db.session.execute(
+                delete(Product).where(Product.id.in_(deletes)),
+                execution_options={'synchronize_session': False}
+            )
+            add_tombstones(Product, deletes, revision)
+
+        commit_changes(revision, Product)
+
+        products = {
+            product.id: product.serialize()
+            for product in Product.query.filter(Product.id.in_(
+                list(created_ids) + [r['id'] for r in changed_rows.values()]
+            ))
+        }
+
+        current_app.logger.info(
+            f"Bulk products: {len(created_ids)} created, "
+            f"{len(changed_rows)} updated, {len(deletes)} deleted"
+        )
+
+        return create_response({
+            'created': [products[product_id] for product_id in created_ids],
+            'updated': [products[row['id']] for row in changed_rows.values()],
+            'deleted': deletes
+        }, HTTPStatus.OK)
+    except BulkValidationError as e:
+        current_app.logger.error(f"Invalid bulk product data: {e.errors}")
+        return create_response(
+            {"message": str(e), "errors": e.errors},
+            HTTPStatus.BAD_REQUEST
+        )
+    except ValueError as e:
+        current_app.logger.error(f"Invalid bulk product data: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        current_app.logger.error(f"Error applying bulk products: {str(e)}")
+        return create_response({
+            "message": "Internal server error"
+        }, HTTPStatus.INTERNAL_SERVER_ERROR)
+
 # Routes for orders
 @bp.route('/orders', methods=['GET'])
 def get_orders() -> ResponseReturnValue:
     """
     Get all orders.
 
+    The orders can be narrowed down with the filters described in
+    :func:`filter_orders` and ordered with ``sort``, see
+    :func:`parse_order_sort`. When ``limit`` or ``after`` is given, a
+    single page of orders is returned instead, see :func:`paginate`.
+
+    Orders embed their product, so the ETag of the response covers both
+    tables, see :func:`table_etag`. A matching ``If-None-Match`` gets an
+    empty 304 response.
+
     Returns:
         tuple: JSON response containing list of orders and HTTP status code.
-            Success: (order_list, 200)
-            Error: (error_message, 500)
+            Success: (order_list, 200), (order_page, 200) or ('', 304)
+            Error: (error_message, 400) or (error_message, 500)
 
     Raises:
+        ValueError: If the filter, sort or pagination parameters are invalid.
         Exception: If database query fails
     """
     try:
-        orders: List[Order] = Order.query.all()
-        current_app.logger.info(f"Retrieved {len(orders)} orders")
-        return create_response(
-            [order.serialize() for order in orders],
-            HTTPStatus.OK
+        etag = table_etag(Order, Product)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+
+        statement = filter_orders(
+            select(*ORDER_ROW_COLUMNS).join(Order.product)
         )
+        keys, descending = parse_order_sort()
+        headers = {'ETag': quote_etag(etag)}
+
+        if is_paginated_request():
+            page = paginate(statement, keys, serialize_order_row, descending)
+            current_app.logger.info(
+                f"Retrieved page of {len(page['items'])} orders"
+            )
+            return create_response(page, HTTPStatus.OK, headers)
+
+        orders = [
+            serialize_order_row(row)
+            for row in db.session.execute(
+                statement.order_by(*order_keys(keys, descending))
+            )
+        ]
+        current_app.logger.info(f"Retrieved {len(orders)} orders")
+        return create_response(orders, HTTPStatus.OK, headers)
+    except ValueError as e:
+        current_app.logger.error(f"Invalid order query: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
     except Exception as e:
         current_app.logger.error(f"Error fetching orders: {str(e)}")
         return create_response({
@@ -179,6 +575,98 @@ def get_orders() -> ResponseReturnValue:
             "error": str(e)
         }, HTTPStatus.INTERNAL_SERVER_ERROR)
 
+@bp.route('/orders/export', methods=['GET'])
+def export_orders() -> ResponseReturnValue:
+    """
+    Export all orders as a stream of NDJSON or CSV.
+
+    The export accepts the same filters and ``sort`` as :func:`get_orders`
+    and the ``format`` parameter (``ndjson``, the default, or ``csv``).
+    Rows are read from the database in batches of EXPORT_BATCH_SIZE and
+    written to the response as they arrive, so memory use does not grow
+    with the number of orders.
+
+    Returns:
+        ResponseReturnValue: Streaming response of the orders, or
+            (error_message, 400) if a parameter is invalid.
+
+    Raises:
+        ValueError: If the format, filter or sort parameters are invalid.
+    """
+    try:
+        export_format = request.args.get('format') or 'ndjson'
+        if export_format not in EXPORT_MIMETYPES:
+            raise ValueError(
+                f"Invalid format. Allowed: {', '.join(EXPORT_MIMETYPES)}"
+            )
+
+        keys, descending = parse_order_sort()
+        statement = filter_orders(
+            select(*ORDER_ROW_COLUMNS).join(Order.product)
+        ).order_by(*order_keys(keys, descending))
+    except ValueError as e:
+        current_app.logger.error(f"Invalid order export: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
+
+    current_app.logger.info(f"Exporting orders as {export_format}")
+
+    return Response(
+        stream_with_context(export_rows(statement, export_format)),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={
+            'Content-Disposition':
+                f'attachment; filename=orders.{export_format}'
+        }
+    )
+
+@bp.route('/orders/<int:order_id>', methods=['GET'])
+def get_order(order_id: int) -> ResponseReturnValue:
+    """
+    Get an order with its product.
+
+    The response carries an ETag like the order list, see
+    :func:`table_etag`, and a matching ``If-None-Match`` gets an empty 304
+    response.
+
+    Args:
+        order_id (int): Order ID.
+
+    Returns:
+        ResponseReturnValue:
+            JSON response containing the order and HTTP status code.
+            Success: (order, 200) or ('', 304)
+            Error: (error_message, 404) or (error_message, 500)
+
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        etag = table_etag(Order, Product)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+
+        row = db.session.execute(
+            select(*ORDER_ROW_COLUMNS)
+            .join(Order.product)
+            .where(Order.id == order_id)
+        ).first()
+        if row is None:
+            return create_response({
+                "message": f"Order with ID {order_id} not found"
+            }, HTTPStatus.NOT_FOUND)
+
+        current_app.logger.info(f"Retrieved order #{order_id}")
+
+        return create_response(
+            serialize_order_row(row), HTTPStatus.OK, {'ETag': quote_etag(etag)}
+        )
+    except Exception as e:
+        current_app.logger.error(f"Error fetching order: {str(e)}")
+        return create_response({
+            "message": "Error fetching order",
+            "error": str(e)
+        }, HTTPStatus.INTERNAL_SERVER_ERROR)
+
 @bp.route('/orders', methods=['POST'])
 def create_order() -> ResponseReturnValue:
     """
@@ -202,22 +690,27 @@ def create_order() -> ResponseReturnValue:
         if data.get('quantity', 0) <= 0:
             raise ValueError("Quantity must be greater than 0")
 
-        product = db.session.get(Product, data['product_id'])
-        if not product:
-            raise ValueError(f"Product with ID {data['product_id']} not found")
-        if product.stock < data['quantity']:
+        data['order_date'] = parse_date(data['order_date'], 'order date')
+
+        revision = bump_table_versions(Order, Product)
+
+        # Reserve the stock with a single conditional UPDATE first, so
+        # concurrent orders cannot both pass the check and oversell.
+        if not adjust_stock({data['product_id']: -data['quantity']}, revision):
+            product = db.session.get(Product, data['product_id'])
+            if not product:
+                raise ValueError(f"Product with ID {data['product_id']} not found")
             raise ValueError(f"Insufficient stock. Available: {product.stock}")
 
         order = Order(**data)
+        order.revision = revision
         db.session.add(order)
 
-        product.stock -= data['quantity']
-
-        db.session.commit()
+        commit_changes(revision, Order, Product)
 
         current_app.logger.info(
             f"Created order #{order.id} for customer {data['customer']}"
-            f" - Product: {product.name}, Quantity: {data['quantity']}"
+            f" - Product: {order.product.name}, Quantity: {data['quantity']}"
         )
 
         return create_response(order.serialize(), HTTPStatus.CREATED)
@@ -254,14 +747,17 @@ def update_order(order_id: int) -> ResponseReturnValue:
             ['product_id', 'quantity', 'customer', 'order_date']
         )
 
+        data['order_date'] = parse_date(data['order_date'], 'order date')
+
         order = db.session.get(Order, order_id)
         if not order:
             raise ValueError(f"Order with ID {order_id} not found")
 
         for key, value in data.items():
             setattr(order, key, value)
+        revision = order.revision = bump_table_versions(Order)
 
-        db.session.commit()
+        commit_changes(revision, Order)
 
         current_app.logger.info(f"Updated order #{order.id} - {order.customer}")
 
@@ -294,14 +790,13 @@ def delete_order(order_id: int) -> ResponseReturnValue:
         if not order:
             raise ValueError(f"Order with ID {order_id} not found")
 
+        revision = bump_table_versions(Order, Product)
         db.session.delete(order)
+        add_tombstones(Order, [order.id], revision)
 
-        product = db.session.get(Product, order.product_id)
-
-        if product is not None:
-            product.stock += order.quantity
+        adjust_stock({order.product_id: order.quantity}, revision)
 
-        db.session.commit()
+        commit_changes(revision, Order, Product)
 
         current_app.logger.info(f"Deleted order #{order.id} - {order.customer}")
 
@@ -315,7 +810,391 @@ def delete_order(order_id: int) -> ResponseReturnValue:
             "message": "Internal server error"
         }, HTTPStatus.INTERNAL_SERVER_ERROR)
 
+@bp.route('/orders/bulk', methods=['POST'])
+def bulk_orders() -> ResponseReturnValue:
+    """
+    Create, update and delete many orders in a single transaction.
+
+    The request body may contain ``create`` (list of orders), ``update``
+    (list of orders including their ``id``) and ``delete`` (list of order
+    IDs). All items are validated up front; if any of them is invalid,
+    nothing is written and the errors are reported per item.
+
+    Stock is checked and adjusted once per product for the whole batch:
+    created orders take their quantity from it and deleted orders give
+    theirs back, like :func:`create_order` and :func:`delete_order` do.
+
+    Returns:
+        tuple: A tuple containing the response data and status code.
+            Success: ({"created": [...], "updated": [...], "deleted": [...]}, 200)
+            Error: ({"message": ..., "errors": [...]}, 400) or
+                (error_message, 500)
+
+    Raises:
+        BulkValidationError: If any item of the batch is invalid.
+        ValueError: If the JSON is invalid.
+        Exception: If an error occurs while applying the batch.
+    """
+    try:
+        creates, updates, deletes = parse_bulk_request(request.json)
+        errors: List[Dict[str, Any]] = []
+
+        new_rows: Dict[int, Dict[str, Any]] = {}
+        for index, item in enumerate(creates):
+            try:
+                new_rows[index] = validate_order_data(item)
+            except ValueError as e:
+                errors.append(bulk_error('create', index, e))
+
+        changed_rows: Dict[int, Dict[str, Any]] = {}
+        for index, item in enumerate(updates):
+            try:
+                changed_rows[index] = {
+                    'id': validate_id(item),
+                    **validate_order_data(item)
+                }
+            except ValueError as e:
+                errors.append(bulk_error('update', index, e))
+
+        existing_orders = {
+            order_id: (product_id, quantity)
+            for order_id, product_id, quantity in db.session.execute(
+                select(Order.id, Order.product_id, Order.quantity).where(
+                    Order.id.in_(
+                        [row['id'] for row in changed_rows.values()] + deletes
+                    )
+                )
+            )
+        }
+
+        for index, row in changed_rows.items():
+            if row['id'] not in existing_orders:
+                errors.append(bulk_error(
+                    'update', index, f"Order with ID {row['id']} not found"
+                ))
+
+        # Net stock change per product over the whole batch.
+        stock_changes: Dict[int, int] = {}
+        for index, order_id in enumerate(deletes):
+            if order_id not in existing_orders:
+                errors.append(bulk_error(
+                    'delete', index, f"Order with ID {order_id} not found"
+                ))
+                continue
+            product_id, quantity = existing_orders[order_id]
+            stock_changes[product_id] = stock_changes.get(product_id, 0) + quantity
+
+        for row in new_rows.values():
+            product_id = row['product_id']
+            stock_changes[product_id] = (
+                stock_changes.get(product_id, 0) - row['quantity']
+            )
+
+        product_ids = {row['product_id'] for row in changed_rows.values()}
+        product_ids.update(stock_changes)
+        stock: Dict[int, int] = dict(db.session.execute(
+            select(Product.id, Product.stock).where(Product.id.in_(product_ids))
+        ).all())
+
+        for operation, rows in (('create', new_rows), ('update', changed_rows)):
+            for index, row in rows.items():
+                product_id = row['product_id']
+                if product_id not in stock:
+                    errors.append(bulk_error(
+                        operation, index, f"Product with ID {product_id} not found"
+                    ))
+                elif (operation == 'create' and
+                      stock[product_id] + stock_changes[product_id] < 0):
+                    errors.append(bulk_error(
+                        operation, index,
+                        f"Insufficient stock. Available: {stock[product_id]}"
+                    ))
+
+        if errors:
+            raise BulkValidationError(errors)
+
+        revision = bump_table_versions(Order, Product)
+        for row in list(new_rows.values()) + list(changed_rows.values()):
+            row['revision'] = revision
+
+        created_ids = insert_many(Order, list(new_rows.values()))
+        if changed_rows:
+            db.session.execute(update(Order), list(changed_rows.values()))
+        if deletes:
+            db.session.execute(
+                delete(Order).where(Order.id.in_(deletes)),
+                execution_options={'synchronize_session': False}
+            )
+            add_tombstones(Order, deletes, revision)
+
+        # Orders of deleted products have no stock to give back.
+        stock_changes = {
+            product_id: change
+            for product_id, change in stock_changes.items() if product_id in stock
+        }
+        if not adjust_stock(stock_changes, revision):
+            raise ValueError("Insufficient stock, the stock changed meanwhile")
+
+        commit_changes(revision, Order, Product)
+
+        orders = {
+            order.id: order.serialize()
+            for order in Order.query.filter(Order.id.in_(
+                list(created_ids) + [r['id'] for r in changed_rows.values()]
+            ))
+        }
+
+        current_app.logger.info(
+            f"Bulk orders: {len(created_ids)} created, "
+            f"{len(changed_rows)} updated, {len(deletes)} deleted"
+        )
+
+        return create_response({
+            'created': [orders[order_id] for order_id in created_ids],
+            'updated': [orders[row['id']] for row in changed_rows.values()],
+            'deleted': deletes
+        }, HTTPStatus.OK)
+    except BulkValidationError as e:
+        current_app.logger.error(f"Invalid bulk order data: {e.errors}")
+        return create_response(
+            {"message": str(e), "errors": e.errors},
+            HTTPStatus.BAD_REQUEST
+        )
+    except ValueError as e:
+        current_app.logger.error(f"Invalid bulk order data: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        current_app.logger.error(f"Error applying bulk orders: {str(e)}")
+        return create_response({
+            "message": "Internal server error"
+        }, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+# Routes for delta syncs
+@bp.route('/sync', methods=['GET'])
+def sync() -> ResponseReturnValue:
+    """
+    Get the products and orders changed after a revision.
+
+    ``since`` is the ``revision`` of the previous sync, 0 (the default)
+    returns everything. ``tables`` optionally limits the response to a
+    comma-separated subset of ``products`` and ``orders``. Orders embed
+    their product, so clients apply product changes to the products
+    embedded in their orders as well.
+
+    Returns:
+        tuple: A tuple containing the response data and status code.
+            Success: ({"revision": ..., "products": [...], "orders": [...],
+                "deleted": {"products": [...], "orders": [...]}}, 200)
+            Error: (error_message, 400) or (error_message, 500)
+
+    Raises:
+        ValueError: If ``since`` or ``tables`` is invalid, or ``since`` is
+            ahead of the server, e.g. because the database was replaced.
+        Exception: If database query fails
+    """
+    try:
+        since = parse_revision(request.args.get('since'))
+        tables = parse_sync_tables(request.args.get('tables'))
+
+        # Read the revision first: rows written meanwhile get a higher
+        # revision and are left for the next sync instead of being skipped.
+        revision = db.session.scalar(
+            select(TableVersion.version)
+            .where(TableVersion.name == TableVersion.REVISION)
+        ) or 0
+        if since > revision:
+            raise ValueError(
+                f"Revision {since} is ahead of the server revision {revision}"
+            )
+
+        changes: Dict[str, Any] = {'revision': revision, 'deleted': {}}
+        for name, model, statement, serialize in (
+            ('products', Product, select(*PRODUCT_ROW_COLUMNS),
+             serialize_product_row),
+            ('orders', Order, select(*ORDER_ROW_COLUMNS).join(Order.product),
+             serialize_order_row),
+        ):
+            if name not in tables:
+                continue
+
+            changed = statement.where(model.revision <= revision)
+            if since:
+                changed = changed.where(model.revision > since)
+            changes[name] = [
+                serialize(row)
+                for row in db.session.execute(changed.order_by(model.id))
+            ]
+            changes['deleted'][name] = list(db.session.scalars(
+                select(Tombstone.row_id).where(
+                    Tombstone.table_name == model.__tablename__,
+                    Tombstone.revision > since,
+                    Tombstone.revision <= revision
+                ).order_by(Tombstone.revision, Tombstone.row_id)
+            )) if since else []
+
+        current_app.logger.info(
+            f"Synced revisions {since} to {revision}: " + ", ".join(
+                f"{len(changes[name])} {name} changed, "
+                f"{len(changes['deleted'][name])} deleted"
+                for name in tables
+            )
+        )
+
+        return create_response(changes, HTTPStatus.OK)
+    except ValueError as e:
+        current_app.logger.error(f"Invalid sync query: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
+    except Exception as e:
+        current_app.logger.error(f"Error syncing changes: {str(e)}")
+        return create_response({
+            "message": "Error syncing changes",
+            "error": str(e)
+        }, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+@bp.route('/sync/revision', methods=['GET'])
+def get_revision() -> ResponseReturnValue:
+    """
+    Get the current revision without any changes.
+
+    Clients that load a table by other means, e.g. page by page, start
+    their delta syncs from this revision instead of a full sync.
+
+    Returns:
+        tuple: A tuple containing the response data and status code.
+            Success: ({"revision": ...}, 200)
+            Error: (error_message, 500)
+
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        revision = db.session.scalar(
+            select(TableVersion.version)
+            .where(TableVersion.name == TableVersion.REVISION)
+        ) or 0
+        return create_response({'revision': revision}, HTTPStatus.OK)
+    except Exception as e:
+        current_app.logger.error(f"Error reading revision: {str(e)}")
+        return create_response({
+            "message": "Error reading revision",
+            "error": str(e)
+        }, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+# Routes for change events
+@bp.route('/events', methods=['GET'])
+def stream_events() -> ResponseReturnValue:
+    """
+    Stream change events as Server-Sent Events.
+
+    Every committed write is announced as a ``change`` event with its
+    revision as event ID and ``{"revision": ..., "tables": [...]}`` as data,
+    where ``tables`` lists the changed tables out of SYNC_TABLES. Clients
+    fetch the changes themselves with :func:`sync`.
+
+    The stream starts at the ``Last-Event-ID`` of a reconnecting client, at
+    ``since``, or else at the current revision. It ends after
+    EVENT_STREAM_DURATION seconds (``EVENT_STREAM_DURATION`` config), and
+    clients reconnect automatically.
+
+    A stream holds a worker thread while it is open, so at most
+    MAX_EVENT_STREAMS (``MAX_EVENT_STREAMS`` config) are open per process.
+    Beyond that, clients get a 503 with a ``Retry-After`` header.
+
+    Returns:
+        ResponseReturnValue: Streaming ``text/event-stream`` response,
+            (error_message, 400) if the start revision is invalid, or
+            (error_message, 503) if too many streams are open.
+
+    Raises:
+        ValueError: If the start revision is invalid.
+    """
+    try:
+        since = parse_revision(
+            request.headers.get('Last-Event-ID') or request.args.get('since')
+        )
+        versions = read_table_versions()
+        revision = versions.get(TableVersion.REVISION, 0)
+        if since:
+            # The table versions at ``since`` are unknown, so the first
+            # event reports every table as changed.
+            revision, versions = since, {}
+    except ValueError as e:
+        current_app.logger.error(f"Invalid event stream request: {str(e)}")
+        return create_response({"message": str(e)}, HTTPStatus.BAD_REQUEST)
+    finally:
+        # Do not hold a database connection while the stream is idle.
+        db.session.close()
+
+    config = current_app.config
+    slots: StreamSlots = current_app.extensions['stream_slots']
+    if not slots.acquire(config.get('MAX_EVENT_STREAMS', MAX_EVENT_STREAMS)):
+        current_app.logger.warning(
+            f"Refused event stream, {slots.open} streams are open"
+        )
+        return create_response(
+            {"message": "Too many event streams, try again later"},
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            {'Retry-After': str(EVENT_BUSY_RETRY)}
+        )
+
+    duration = config.get('EVENT_STREAM_DURATION', EVENT_STREAM_DURATION)
+    interval = config.get('EVENT_POLL_INTERVAL', EVENT_POLL_INTERVAL)
+    notifier = change_notifier()
+
+    def generate(revision: int, versions: Dict[str, int]) -> Iterator[str]:
+        deadline = time.monotonic() + duration
+        yield f"retry: {EVENT_RETRY}\n\n"
+
+        while True:
+            current = read_table_versions()
+            db.session.close()
+
+            if current.get(TableVersion.REVISION, 0) > revision:
+                revision = current[TableVersion.REVISION]
+                tables = [
+                    name for name, table in SYNC_TABLE_NAMES.items()
+                    if current.get(table) != versions.get(table)
+                ] if versions else list(SYNC_TABLES)
+                versions = current
+                data = json.dumps({'revision': revision, 'tables': tables})
+                yield f"id: {revision}\nevent: change\ndata: {data}\n\n"
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not notifier.wait(revision, min(interval, remaining)):
+                # Comments keep proxies and clients from timing out.
+                yield ": keep-alive\n\n"
+
+    current_app.logger.info(f"Streaming change events after revision {revision}")
+
+    response = Response(
+        stream_with_context(generate(revision, versions)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # The server closes the response when the stream ends or the client
+    # disconnects, even if it never started.
+    response.call_on_close(slots.release)
+    return response
+
+@bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats() -> ResponseReturnValue:
+    """
+    Get the statistics of the product cache of this worker process.
+
+    Returns:
+        tuple: A tuple containing the cache statistics and status code.
+    """
+    return create_response({'products': product_cache().stats()}, HTTPStatus.OK)
+
 # Helper functions
+class BulkValidationError(ValueError):
+    """Raised when one or more items of a bulk request are invalid."""
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(f"{len(errors)} invalid item(s), nothing was applied")
+        self.errors = errors
+
 def validate_request_data(data: Dict[str, Any], required_fields: List[str]) -> None:
     """
     Validate request data.
@@ -336,9 +1215,686 @@ def validate_request_data(data: Dict[str, Any], required_fields: List[str]) -> N
             f"Missing required fields: {', '.join(missing_fields)}"
         )
 
+def validate_product_data(data: Any) -> Dict[str, Any]:
+    """
+    Validate the data of a product.
+
+    Args:
+        data (dict): Product data.
+
+    Returns:
+        dict: The product fields of the data.
+
+    Raises:
+        ValueError: If the data is invalid or missing required fields.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Invalid JSON")
+
+    validate_request_data(data, PRODUCT_FIELDS)
+
+    if not isinstance(data['price'], (int, float)) or data['price'] <= 0:
+        raise ValueError("Price must be greater than 0")
+
+    if not isinstance(data['stock'], int) or data['stock'] < 0:
+        raise ValueError("Stock must be greater than or equal to 0")
+
+    return {field: data[field] for field in PRODUCT_FIELDS}
+
+def validate_order_data(data: Any) -> Dict[str, Any]:
+    """
+    Validate the data of an order.
+
+    Args:
+        data (dict): Order data.
+
+    Returns:
+        dict: The order fields of the data, with the order date parsed.
+
+    Raises:
+        ValueError: If the data is invalid or missing required fields.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Invalid JSON")
+
+    validate_request_data(data, ORDER_FIELDS)
+
+    if not isinstance(data['product_id'], int):
+        raise ValueError("Product ID must be an integer")
+
+    if not isinstance(data['quantity'], int) or data['quantity'] <= 0:
+        raise ValueError("Quantity must be greater than 0")
+
+    fields = {field: data[field] for field in ORDER_FIELDS}
+    fields['order_date'] = parse_date(data['order_date'], 'order date')
+    if 'status' in data:
+        status = data['status']
+        if not isinstance(status, str) or not 0 < len(status) <= STATUS_LENGTH:
+            raise ValueError(
+                f"Status must be a string of 1 to {STATUS_LENGTH} characters"
+            )
+        fields['status'] = status
+
+    return fields
+
+def validate_id(data: Any) -> int:
+    """
+    Validate the ID of an item of a bulk update.
+
+    Args:
+        data (dict): Item data.
+
+    Returns:
+        int: The ID of the item.
+
+    Raises:
+        ValueError: If the ID is missing or not an integer.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('id'), int):
+        raise ValueError("Missing required fields: id")
+
+    return data['id']
+
+def parse_bulk_request(
+    data: Any
+) -> Tuple[List[Any], List[Any], List[int]]:
+    """
+    Split a bulk request into its create, update and delete items.
+
+    Args:
+        data (dict): Request data.
+
+    Returns:
+        tuple: The items to create, the items to update and the IDs to delete.
+
+    Raises:
+        ValueError: If the JSON is invalid or the batch is too large.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Invalid JSON")
+
+    creates = data.get('create', [])
+    updates = data.get('update', [])
+    deletes = data.get('delete', [])
+
+    for items in (creates, updates, deletes):
+        if not isinstance(items, list):
+            raise ValueError("create, update and delete must be lists")
+
+    if not all(isinstance(item_id, int) for item_id in deletes):
+        raise ValueError("IDs to delete must be integers")
+
+    if len(set(deletes)) != len(deletes):
+        raise ValueError("IDs to delete must be unique")
+
+    if len(creates) + len(updates) + len(deletes) > MAX_BULK_SIZE:
+        raise ValueError(f"A batch may contain at most {MAX_BULK_SIZE} items")
+
+    return creates, updates, deletes
+
+def bulk_error(operation: str, index: int, error: Any) -> Dict[str, Any]:
+    """
+    Describe an invalid item of a bulk request.
+
+    Args:
+        operation (str): Operation of the item (create, update or delete).
+        index (int): Position of the item in its list.
+        error (any): Error or error message.
+
+    Returns:
+        dict: The error report of the item.
+    """
+    return {'operation': operation, 'index': index, 'message': str(error)}
+
+def insert_many(model: Any, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert many rows with multi-row INSERT statements.
+
+    Args:
+        model (Model): Model to insert.
+        rows (list): Column values of the rows.
+
+    Returns:
+        list: IDs of the new rows, in the order of ``rows``.
+    """
+    if not rows:
+        return []
+
+    # SQLAlchemy batches the rows into multi-row INSERTs and returns the
+    # IDs in the order of the parameters.
+    return list(db.session.scalars(
+        insert(model).returning(model.id, sort_by_parameter_order=True), rows
+    ))
+
+def adjust_stock(changes: Dict[int, int], revision: int) -> bool:
+    """
+    Atomically apply stock changes with one conditional UPDATE.
+
+    Every product is updated with ``stock = stock + change`` only if the
+    result is not negative, so the check and the write cannot be split by
+    a concurrent request.
+
+    Args:
+        changes (dict): Stock change per product ID.
+        revision (int): Revision of the write, see :func:`bump_table_versions`.
+
+    Returns:
+        bool: True if every product was updated, False if a product does
+            not exist or has insufficient stock.
+    """
+    rows = [
+        {'b_id': product_id, 'b_change': change}
+        for product_id, change in changes.items() if change
+    ]
+    if not rows:
+        return True
+
+    table = Product.__table__
+    result = db.session.execute(
+        update(table)
+        .where(
+            table.c.id == bindparam('b_id'),
+            table.c.stock + bindparam('b_change') >= 0
+        )
+        .values(stock=table.c.stock + bindparam('b_change'), revision=revision),
+        rows
+    )
+    return result.rowcount == len(rows)
+
+def export_rows(statement: Any, export_format: str) -> Iterator[str]:
+    """
+    Stream the rows of an order statement as NDJSON or CSV.
+
+    The statement is executed with ``yield_per``, so only one batch of rows
+    is held in memory, and every batch is written as a single chunk.
+
+    Args:
+        statement (Select): Statement selecting ORDER_ROW_COLUMNS.
+        export_format (str): ``ndjson`` or ``csv``.
+
+    Yields:
+        str: The encoded rows of one batch, the CSV header first.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == 'csv':
+        writer.writerow(ORDER_EXPORT_FIELDS)
+        yield buffer.getvalue()
+
+    dumps = current_app.json.dumps
+    count = 0
+    try:
+        result = db.session.execute(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for rows in result.partitions():
+            count += len(rows)
+            if export_format == 'csv':
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            else:
+                yield ''.join(
+                    dumps(serialize_order_row(row), separators=(',', ':')) + '\n'
+                    for row in rows
+                )
+    except Exception as e:
+        # The status line is already sent, so all that is left is to log the
+        # error and cut the response short.
+        current_app.logger.error(f"Error exporting orders: {str(e)}")
+        raise
+
+    current_app.logger.info(f"Exported {count} orders")
+
+def product_cache() -> LRUCache:
+    """
+    Get the product cache of the current app.
+
+    Returns:
+        LRUCache: The cache created by :func:`init_product_cache`.
+    """
+    return current_app.extensions['product_cache']
+
+def change_notifier() -> ChangeNotifier:
+    """
+    Get the change notifier of the current app.
+
+    Returns:
+        ChangeNotifier: The notifier created by :func:`init_change_notifier`.
+    """
+    return current_app.extensions['change_notifier']
+
+def read_table_versions() -> Dict[str, int]:
+    """
+    Read the versions of all tables and the global revision.
+
+    Returns:
+        dict: Versions by table name, see TableVersion.
+    """
+    return dict(db.session.execute(
+        select(TableVersion.name, TableVersion.version)
+    ).all())
+
+def bump_table_versions(*models: Any) -> int:
+    """
+    Bump the versions of the tables of models in the current transaction.
+
+    Every write route calls this once before it writes, so the versions
+    change together with the rows they describe. The global revision is
+    bumped as well; the route stamps it on every row it writes and every
+    tombstone it leaves.
+
+    Args:
+        *models (Model): Models whose tables are written.
+
+    Returns:
+        int: The revision of the write.
+    """
+    names = [model.__tablename__ for model in models] + [TableVersion.REVISION]
+    statement = sqlite_insert(TableVersion).values([
+        {'name': name, 'version': 1} for name in names
+    ])
+    versions = dict(db.session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={'version': TableVersion.version + 1}
+        ).returning(TableVersion.name, TableVersion.version)
+    ).all())
+    return versions[TableVersion.REVISION]
+
+def commit_changes(revision: int, *models: Any) -> None:
+    """
+    Commit a write and announce it.
+
+    Clears the product cache if products were written and wakes up the
+    event streams of this process, see :func:`stream_events`.
+
+    Args:
+        revision (int): Revision of the write, see :func:`bump_table_versions`.
+        *models (Model): Models whose tables were written.
+    """
+    db.session.commit()
+
+    if Product in models:
+        product_cache().clear()
+    change_notifier().notify(revision)
+
+def add_tombstones(model: Any, ids: List[int], revision: int) -> None:
+    """
+    Record deleted rows for delta syncs.
+
+    Args:
+        model (Model): Model of the deleted rows.
+        ids (list): IDs of the deleted rows.
+        revision (int): Revision of the delete.
+    """
+    db.session.execute(insert(Tombstone), [
+        {'table_name': model.__tablename__, 'row_id': row_id, 'revision': revision}
+        for row_id in ids
+    ])
+
+def table_etag(*models: Any) -> str:
+    """
+    Build a strong ETag for a read of the tables of models.
+
+    The tag covers the current versions of the tables and the path and
+    query string of the request, which select the representation. It is read before the
+    rows, so a concurrent write can only make it older than the response,
+    never newer.
+
+    Args:
+        *models (Model): Models whose tables the response is built from.
+
+    Returns:
+        str: The unquoted ETag.
+    """
+    names = [model.__tablename__ for model in models]
+    versions = dict(db.session.execute(
+        select(TableVersion.name, TableVersion.version)
+        .where(TableVersion.name.in_(names))
+    ).all())
+
+    key = json.dumps([
+        [versions.get(name, 0) for name in names],
+        request.path,
+        sorted(request.args.items(multi=True))
+    ])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def not_modified(etag: str) -> ResponseReturnValue:
+    """
+    Create an empty 304 response.
+
+    Args:
+        etag (str): Unquoted ETag of the unchanged resource.
+
+    Returns:
+        tuple: A tuple containing the empty body, status code and headers.
+    """
+    return '', HTTPStatus.NOT_MODIFIED, {'ETag': quote_etag(etag)}
+
+def is_paginated_request() -> bool:
+    """
+    Check whether the client asked for a single page of results.
+
+    Returns:
+        bool: True if ``limit`` or ``after`` is set in the query string.
+    """
+    return 'limit' in request.args or 'after' in request.args
+
+def paginate(
+    statement: Any,
+    keys: List[Any],
+    serialize: Callable[[Any], Dict[str, Any]],
+    descending: bool = False
+) -> Dict[str, Any]:
+    """
+    Fetch one page of a SELECT statement using keyset pagination.
+
+    Rows are ordered by ``keys`` and only rows after the ``after`` cursor
+    are read, so a page costs the same no matter how deep the client is.
+
+    Args:
+        statement (Select): Statement to paginate. It must select every key
+            column under its own name.
+        keys (list): Indexed columns the pages are keyed on. Together they
+            must be unique, so the last one is usually the primary key.
+        serialize (callable): Function serializing a row of the statement.
+        descending (bool): Whether to walk the keys in descending order.
+
+    Returns:
+        dict: The serialized rows under ``items`` and the cursor of the
+            next page under ``next_cursor`` (None on the last page).
+
+    Raises:
+        ValueError: If ``limit`` or ``after`` is invalid.
+    """
+    limit = parse_limit(request.args.get('limit'))
+    after = request.args.get('after')
+
+    if after:
+        values = decode_cursor(after)
+        if len(values) != len(keys):
+            raise ValueError("Invalid cursor")
+
+        values = [
+            parse_date(value, 'cursor') if isinstance(key.type, db.Date) else value
+            for key, value in zip(keys, values, strict=True)
+        ]
+
+        position = tuple_(*keys) if len(keys) > 1 else keys[0]
+        bound = tuple_(*values) if len(keys) > 1 else values[0]
+        statement = statement.where(
+            position < bound if descending else position > bound
+        )
+
+    rows = db.session.execute(
+        statement.order_by(*order_keys(keys, descending)).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+    return {
+        'items': [serialize(row) for row in rows],
+        'next_cursor': next_cursor
+    }
+
+def order_keys(keys: List[Any], descending: bool) -> List[Any]:
+    """
+    Build the ORDER BY clauses for a list of key columns.
+
+    Args:
+        keys (list): Columns to order by.
+        descending (bool): Whether to order in descending order.
+
+    Returns:
+        list: ORDER BY clauses.
+    """
+    return [key.desc() if descending else key.asc() for key in keys]
+
+def filter_orders(query: Any) -> Any:
+    """
+    Apply the order filters of the request to a query.
+
+    Supported filters are ``customer``, ``status``, ``product_id`` and the
+    inclusive ``order_date_from``/``order_date_to`` range. Each of them is
+    backed by one of the indexes of the Order model.
+
+    ``search`` is a free-text search: every space-separated term must be
+    the ID of the order or start a word of its customer or product name,
+    ignoring case. It scans the orders instead of using an index, so
+    combine it with an indexed filter on large tables where possible.
+
+    Args:
+        query (Select): Order query, joined with the products.
+
+    Returns:
+        Select: The filtered query.
+
+    Raises:
+        ValueError: If a filter value is invalid.
+    """
+    args = request.args
+
+    if args.get('customer'):
+        query = query.filter(Order.customer == args['customer'])
+
+    if args.get('status'):
+        query = query.filter(Order.status == args['status'])
+
+    if args.get('product_id'):
+        try:
+            product_id = int(args['product_id'])
+        except ValueError:
+            raise ValueError("Product ID must be an integer") from None
+        query = query.filter(Order.product_id == product_id)
+
+    if args.get('order_date_from'):
+        date_from = parse_date(args['order_date_from'], 'order_date_from')
+        query = query.filter(Order.order_date >= date_from)
+
+    if args.get('order_date_to'):
+        date_to = parse_date(args['order_date_to'], 'order_date_to')
+        query = query.filter(Order.order_date <= date_to)
+
+    for term in args.get('search', '').split():
+        pattern = escape_like(term)
+        conditions = [
+            column.ilike(f'{prefix}{pattern}%', escape='\\')
+            for column in (Order.customer, Product.name)
+            for prefix in ('', '% ')
+        ]
+        if term.isdigit():
+            conditions.append(Order.id == int(term))
+        query = query.filter(or_(*conditions))
+
+    return query
+
+def escape_like(value: str) -> str:
+    """
+    Escape the wildcards of a LIKE pattern.
+
+    Args:
+        value (str): Literal text.
+
+    Returns:
+        str: The text with ``%``, ``_`` and ``\\`` escaped by a backslash.
+    """
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def parse_order_sort() -> Tuple[List[Any], bool]:
+    """
+    Parse the ``sort`` parameter of an order query.
+
+    The value is a column name out of ORDER_SORT_KEYS, prefixed with ``-``
+    for descending order. The order ID is always added as a tie-breaker.
+
+    Returns:
+        tuple: The columns to order by and whether to sort descending.
+
+    Raises:
+        ValueError: If the sort key is not supported.
+    """
+    sort = request.args.get('sort') or 'id'
+    descending = sort.startswith('-')
+    name = sort.lstrip('-')
+
+    if name not in ORDER_SORT_KEYS:
+        raise ValueError(
+            f"Invalid sort key. Allowed: {', '.join(ORDER_SORT_KEYS)}"
+        )
+
+    column = ORDER_SORT_KEYS[name]
+    keys = [Order.id] if column is Order.id else [column, Order.id]
+
+    return keys, descending
+
+def parse_revision(value: Optional[str]) -> int:
+    """
+    Parse the ``since`` revision of a sync request.
+
+    Args:
+        value (str): Raw ``since`` query parameter.
+
+    Returns:
+        int: The revision, 0 if no value was given.
+
+    Raises:
+        ValueError: If the value is not a non-negative integer.
+    """
+    if value is None or value == '':
+        return 0
+
+    try:
+        revision = int(value)
+    except ValueError:
+        raise ValueError("Revision must be an integer") from None
+
+    if revision < 0:
+        raise ValueError("Revision must be greater than or equal to 0")
+
+    return revision
+
+def parse_sync_tables(value: Optional[str]) -> List[str]:
+    """
+    Parse the ``tables`` parameter of a sync request.
+
+    Args:
+        value (str): Raw ``tables`` query parameter.
+
+    Returns:
+        list: Names out of SYNC_TABLES, all of them if no value was given.
+
+    Raises:
+        ValueError: If a table name is not supported.
+    """
+    if not value:
+        return list(SYNC_TABLES)
+
+    tables = value.split(',')
+    if not set(tables) <= set(SYNC_TABLES):
+        raise ValueError(f"Invalid tables. Allowed: {', '.join(SYNC_TABLES)}")
+
+    return [table for table in SYNC_TABLES if table in tables]
+
+def parse_limit(value: Optional[str]) -> int:
+    """
+    Parse the page size of a request.
+
+    Args:
+        value (str): Raw ``limit`` query parameter.
+
+    Returns:
+        int: Page size, DEFAULT_PAGE_SIZE if no value was given.
+
+    Raises:
+        ValueError: If the value is not an integer between 1 and MAX_PAGE_SIZE.
+    """
+    if value is None or value == '':
+        return DEFAULT_PAGE_SIZE
+
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("Limit must be an integer") from None
+
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    return limit
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the key values of the last row of a page as an opaque cursor.
+
+    Args:
+        values (list): Key values of the row.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, date) else value
+         for value in values],
+        separators=(',', ':')
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor created by :func:`encode_cursor`.
+
+    Args:
+        cursor (str): Cursor string.
+
+    Returns:
+        list: Key values of the row the cursor points at.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid cursor")
+
+    return values
+
+def parse_date(value: Any, field: str) -> date:
+    """
+    Parse an ISO 8601 date (YYYY-MM-DD).
+
+    Args:
+        value (any): Raw value from the request.
+        field (str): Name of the field, used in the error message.
+
+    Returns:
+        date: The parsed date.
+
+    Raises:
+        ValueError: If the value is not a valid ISO 8601 date.
+    """
+    try:
+        # Unlike date.fromisoformat(), strptime() rejects the compact and
+        # week date forms of ISO 8601.
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Invalid {field}: {value!r}. Expected format YYYY-MM-DD"
+        ) from None
+
 def create_response(
     data: Any,
-    status: HTTPStatus = HTTPStatus.OK
+    status: HTTPStatus = HTTPStatus.OK,
+    headers: Optional[Dict[str, str]] = None
 ) -> ResponseReturnValue:
     """
     Create a JSON response.
@@ -346,8 +1902,9 @@ def create_response(
     Args:
         data (any): Response data.
         status (HTTPStatus): HTTP status code.
+        headers (dict): Additional response headers.
 
     Returns:
-        tuple: A tuple containing the response data and status code.
+        tuple: A tuple containing the response data, status code and headers.
     """
-    return jsonify(data), status
+    return jsonify(data), status, headers or {}
@@ -1,19 +1,66 @@
 import os
+from typing import Any, Dict, Optional
 
+from database import (
+    DEFAULT_SQLITE_PRAGMAS,
+    default_engine_options,
+    enable_sqlite_pragmas,
+)
 from flask import Flask
+from json_provider import create_json_provider
+from migrate import add_missing_columns, migrate_order_dates
 from models import db
 from routes import bp
 
-app = Flask(__name__)
-db_path = os.path.join(app.instance_path, 'order_manager.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
 
-with app.app_context():
-    db.create_all()
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """
+    Create and configure the application.
 
-app.register_blueprint(bp, url_prefix='/api')
+    Args:
+        config (dict): Config values overriding the defaults.
+
+    Returns:
+        Flask: The configured application.
+    """
+    app = Flask(__name__)
+    app.json = create_json_provider(app)
+    db_path = os.path.join(app.instance_path, 'order_manager.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLITE_PRAGMAS'] = dict(DEFAULT_SQLITE_PRAGMAS)
+    if 'MAX_EVENT_STREAMS' in os.environ:
+        app.config['MAX_EVENT_STREAMS'] = int(os.environ['MAX_EVENT_STREAMS'])
+    app.config.update(config or {})
+    app.config.setdefault(
+        'SQLALCHEMY_ENGINE_OPTIONS',
+        default_engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    )
+
+    os.makedirs(app.instance_path, exist_ok=True)
+    db.init_app(app)
+
+    with app.app_context():
+        enable_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+        # Add new columns first, rebuilding the order table copies them.
+        add_missing_columns(db.engine)
+        migrate_order_dates(db.engine)
+        db.create_all()
+
+        # create_all() skips existing tables, so add indexes introduced later.
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
+
+    app.register_blueprint(bp, url_prefix='/api')
+
+    return app
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Development server only, production runs under gunicorn, see
+    # gunicorn.conf.py.
+    create_app().run(
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', 5000)),
+        debug=os.environ.get('FLASK_DEBUG') == '1'
+    )
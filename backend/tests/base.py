@@ -0,0 +1,69 @@
+import sys
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from models import db
+from server import create_app
+
+TEST_CONFIG = {
+    'TESTING': True,
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+    'SERVER_NAME': 'localhost',
+}
+
+_app: Optional[Flask] = None
+
+
+def get_app() -> Flask:
+    """Get the test app, creating it and its schema on first use."""
+    global _app
+    if _app is None:
+        _app = create_app(TEST_CONFIG)
+        with _app.app_context():
+            db.session.configure(join_transaction_mode='create_savepoint')
+    return _app
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Test case running each test in a transaction that is rolled back.
+
+    All tests share one in-memory schema. Every test binds the sessions of
+    the app to a connection inside an outer transaction, and commits made
+    by the routes only release savepoints within it.
+    """
+    def setUp(self):
+        """Begin the outer transaction and bind the sessions to it."""
+        self.app = get_app()
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        self.engines = db.engines
+        self.engine = self.engines[None]
+        self.connection = self.engine.connect()
+        self.transaction = self.connection.begin()
+        # pysqlite only begins a transaction before DML, so begin it
+        # explicitly, otherwise releasing the first savepoint would commit.
+        self.connection.exec_driver_sql('BEGIN')
+
+        # Flask-SQLAlchemy picks the bind from its engine map, so route
+        # every session to the connection while the test runs.
+        self.engines[None] = self.connection  # type: ignore[index]
+
+        # The product cache is keyed on table versions, which start over
+        # when the previous test is rolled back.
+        self.app.extensions['product_cache'].clear()
+
+    def tearDown(self):
+        """Roll back everything the test wrote."""
+        db.session.remove()
+        self.engines[None] = self.engine  # type: ignore[index]
+        self.transaction.rollback()
+        self.connection.close()
+        self.ctx.pop()
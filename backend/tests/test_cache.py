@@ -0,0 +1,79 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_set(self):
+        """Test values are cached and lookups are counted."""
+        cache = LRUCache(max_size=2, ttl=60)
+
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', [1])
+        self.assertEqual(cache.get('a'), [1])
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+        self.assertEqual(stats['size'], 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = LRUCache(max_size=2, ttl=0.01)
+        cache.set('a', 1)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_clear(self):
+        """Test clearing the cache keeps the counters."""
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_concurrent_access(self):
+        """Test counters and size stay consistent across threads."""
+        cache = LRUCache(max_size=10, ttl=60)
+
+        def worker(offset):
+            for i in range(1000):
+                key = (offset + i) % 20
+                if cache.get(key) is None:
+                    cache.set(key, key)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 8000)
+        self.assertLessEqual(stats['size'], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from models import Product, db
+from server import create_app
+
+THREADS = 32
+ORDERS = 300
+STOCK = 100
+
+
+class TestConcurrency(unittest.TestCase):
+    def setUp(self):
+        """Set up an app on a file database shared by all threads."""
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}',
+            'SQLALCHEMY_ENGINE_OPTIONS': {
+                'pool_size': THREADS,
+                'connect_args': {'timeout': 30},
+            },
+        })
+
+        with self.app.app_context():
+            product = Product(name='Test Product', brand='Test Brand',
+                              price=9.99, stock=STOCK)
+            db.session.add(product)
+            db.session.commit()
+            self.product_id = product.id
+
+    def tearDown(self):
+        """Remove the database."""
+        with self.app.app_context():
+            db.engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_concurrent_orders_never_oversell(self):
+        """Test concurrent POST /orders never drive stock below zero."""
+        barrier = threading.Barrier(THREADS)
+
+        def create_order(i):
+            if i < THREADS:
+                barrier.wait()
+            response = self.app.test_client().post('/api/orders', json={
+                "product_id": self.product_id,
+                "quantity": 1,
+                "customer": f"Customer {i}",
+                "order_date": "2023-09-20"
+            })
+            return response.status_code
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            statuses = list(executor.map(create_order, range(ORDERS)))
+
+        self.assertEqual(statuses.count(201), STOCK)
+        self.assertEqual(statuses.count(400), ORDERS - STOCK)
+
+        client = self.app.test_client()
+        products = json.loads(client.get('/api/products').data)
+        self.assertEqual(products[0]['stock'], 0)
+        orders = json.loads(client.get('/api/orders').data)
+        self.assertEqual(len(orders), STOCK)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from database import DEFAULT_SQLITE_PRAGMAS, enable_sqlite_pragmas
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        """Set up an engine on a file database."""
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+
+    def tearDown(self):
+        """Remove the database."""
+        self.engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_enable_sqlite_pragmas(self):
+        """Test the pragmas are applied to new connections."""
+        enable_sqlite_pragmas(self.engine, DEFAULT_SQLITE_PRAGMAS)
+
+        with self.engine.connect() as conn:
+            def pragma(name):
+                return conn.execute(text(f'PRAGMA {name}')).scalar()
+
+            self.assertEqual(pragma('journal_mode'), 'wal')
+            self.assertEqual(pragma('synchronous'), 1)
+            self.assertEqual(pragma('cache_size'), -64000)
+            self.assertEqual(pragma('busy_timeout'), 5000)
+            self.assertEqual(pragma('foreign_keys'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
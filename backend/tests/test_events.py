@@ -0,0 +1,52 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from events import ChangeNotifier, StreamSlots
+
+
+class TestChangeNotifier(unittest.TestCase):
+    def test_wait_timeout(self):
+        """Test waiting for a newer revision times out without a write."""
+        notifier = ChangeNotifier()
+        notifier.notify(3)
+
+        self.assertFalse(notifier.wait(3, timeout=0.01))
+        self.assertTrue(notifier.wait(2, timeout=0.01))
+
+    def test_notify_wakes_waiters(self):
+        """Test a write wakes up every waiting thread."""
+        notifier = ChangeNotifier()
+        results = []
+
+        def waiter():
+            results.append(notifier.wait(0, timeout=5))
+
+        threads = [threading.Thread(target=waiter) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        notifier.notify(1)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [True] * 4)
+        self.assertEqual(notifier.revision, 1)
+
+class TestStreamSlots(unittest.TestCase):
+    def test_acquire_up_to_limit(self):
+        """Test slots are handed out up to the limit and can be reused."""
+        slots = StreamSlots()
+
+        self.assertTrue(slots.acquire(2))
+        self.assertTrue(slots.acquire(2))
+        self.assertFalse(slots.acquire(2))
+
+        slots.release()
+        self.assertTrue(slots.acquire(2))
+        self.assertEqual(slots.open, 2)
+
+if __name__ == '__main__':
+    unittest.main()
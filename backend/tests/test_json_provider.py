@@ -0,0 +1,49 @@
+import sys
+import unittest
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from json_provider import OrjsonProvider, create_json_provider, orjson
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class TestJsonProvider(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.default = DefaultJSONProvider(self.app)
+        self.provider = OrjsonProvider(self.app)
+
+    def test_create_json_provider(self):
+        """Test the orjson provider is used when orjson is installed."""
+        self.assertIsInstance(create_json_provider(self.app), OrjsonProvider)
+
+    def test_dumps_matches_default(self):
+        """Test the orjson provider encodes like the default provider."""
+        data = {
+            'b': [1, 2.5, None, True],
+            'a': {'order_date': date(2021, 1, 1), 'price': Decimal('9.99')}
+        }
+
+        self.assertEqual(
+            self.provider.dumps(data),
+            self.default.dumps(data, separators=(',', ':'))
+        )
+        self.assertEqual(self.provider.loads(self.provider.dumps(data)),
+                         self.default.loads(self.default.dumps(data)))
+
+    def test_response(self):
+        """Test JSON responses are compact and end with a newline."""
+        with self.app.app_context():
+            response = self.provider.response({'b': 1, 'a': [1, 2]})
+
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.data, b'{"a":[1,2],"b":1}\n')
+
+if __name__ == '__main__':
+    unittest.main()
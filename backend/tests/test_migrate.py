@@ -0,0 +1,115 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from migrate import add_missing_columns, migrate_order_dates, parse_legacy_date
+
+LEGACY_SCHEMA = [
+    'CREATE TABLE product (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, '
+    'brand VARCHAR(100) NOT NULL, price FLOAT NOT NULL, stock INTEGER NOT NULL)',
+    'CREATE TABLE "order" (id INTEGER PRIMARY KEY, product_id INTEGER NOT NULL '
+    'REFERENCES product (id), quantity INTEGER NOT NULL, '
+    'customer VARCHAR(100) NOT NULL, order_date VARCHAR(100) NOT NULL, '
+    'status VARCHAR(20))',
+    "INSERT INTO product VALUES (1, 'Test Product', 'Test Brand', 10.0, 100)",
+]
+
+
+class TestMigrate(unittest.TestCase):
+    def setUp(self):
+        """Set up a database with the legacy schema."""
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        with self.engine.begin() as conn:
+            for statement in LEGACY_SCHEMA:
+                conn.execute(text(statement))
+
+    def tearDown(self):
+        """Remove the database."""
+        self.engine.dispose()
+        os.remove(self.db_path)
+
+    def insert_orders(self, order_dates):
+        """Insert orders with the given raw order dates."""
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    'INSERT INTO "order" (product_id, quantity, customer, '
+                    "order_date, status) VALUES (1, 1, 'Test Customer', "
+                    ":order_date, 'open')"
+                ),
+                [{'order_date': order_date} for order_date in order_dates]
+            )
+
+    def test_migrate_order_dates(self):
+        """Test legacy order dates are converted in place."""
+        self.insert_orders(['2023-09-20', '21.09.2023', '2023-09-22 10:30:00'])
+
+        self.assertEqual(migrate_order_dates(self.engine), 3)
+
+        with self.engine.connect() as conn:
+            order_dates = conn.execute(
+                text('SELECT order_date FROM "order" ORDER BY id')
+            ).scalars().all()
+        self.assertEqual(order_dates, ['2023-09-20', '2023-09-21', '2023-09-22'])
+
+        inspector = inspect(self.engine)
+        columns = {c['name']: c for c in inspector.get_columns('order')}
+        self.assertEqual(str(columns['order_date']['type']), 'DATE')
+        indexes = {index['name'] for index in inspector.get_indexes('order')}
+        self.assertIn('ix_order_order_date', indexes)
+
+        self.assertEqual(migrate_order_dates(self.engine), 0)
+
+    def test_migrate_order_dates_invalid(self):
+        """Test nothing is changed if an order date cannot be parsed."""
+        self.insert_orders(['2023-09-20', 'next tuesday'])
+
+        with self.assertRaises(ValueError):
+            migrate_order_dates(self.engine)
+
+        with self.engine.connect() as conn:
+            order_dates = conn.execute(
+                text('SELECT order_date FROM "order" ORDER BY id')
+            ).scalars().all()
+        self.assertEqual(order_dates, ['2023-09-20', 'next tuesday'])
+        columns = {c['name']: c for c in inspect(self.engine).get_columns('order')}
+        self.assertEqual(str(columns['order_date']['type']), 'VARCHAR(100)')
+
+    def test_add_missing_columns(self):
+        """Test new model columns are added to existing tables."""
+        self.insert_orders(['21.09.2023'])
+
+        self.assertEqual(
+            add_missing_columns(self.engine),
+            ['product.revision', 'product._sentinel',
+             'order.revision', 'order._sentinel']
+        )
+        self.assertEqual(migrate_order_dates(self.engine), 1)
+
+        with self.engine.connect() as conn:
+            revisions = conn.execute(
+                text('SELECT revision FROM product UNION ALL '
+                     'SELECT revision FROM "order"')
+            ).scalars().all()
+        self.assertEqual(revisions, [0, 0])
+
+        self.assertEqual(add_missing_columns(self.engine), [])
+
+    def test_parse_legacy_date(self):
+        """Test parsing of legacy order dates."""
+        self.assertEqual(parse_legacy_date(' 2023-09-20 '), date(2023, 9, 20))
+        self.assertEqual(parse_legacy_date('2023/09/20'), date(2023, 9, 20))
+        self.assertIsNone(parse_legacy_date(''))
+        self.assertIsNone(parse_legacy_date(None))
+
+if __name__ == '__main__':
+    unittest.main()
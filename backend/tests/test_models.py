@@ -1,34 +1,24 @@
+import itertools
 import sys
 import unittest
+from datetime import date
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from models import Order, Product, db
-from server import app
-
-
-class TestModels(unittest.TestCase):
-    def setUp(self):
-        """Set up test database."""
-        app.config.update({
-            'TESTING': True,
-            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
-            'SERVER_NAME': 'localhost',
-        })
-        self.app = app
-        self.client = app.test_client()
-        self.ctx = app.app_context()
-        self.ctx.push()
-        db.create_all()
-
-    def tearDown(self):
-        """Tear down test database."""
-        db.session.remove()
-        db.drop_all()
-        self.ctx.pop()
+from base import DatabaseTestCase
+from models import (
+    ORDER_ROW_COLUMNS,
+    PRODUCT_ROW_COLUMNS,
+    Order,
+    Product,
+    db,
+    serialize_order_row,
+    serialize_product_row,
+)
 
+
+class TestModels(DatabaseTestCase):
     def test_product(self):
         """Test product model."""
         product = Product()
@@ -61,7 +51,7 @@ class TestModels(unittest.TestCase):
         order.product_id = product.id
         order.quantity = 10
         order.customer = 'Test Customer'
-        order.order_date = '2021-01-01'
+        order.order_date = date(2021, 1, 1)
 
         db.session.add(order)
         db.session.commit()
@@ -70,8 +60,111 @@ class TestModels(unittest.TestCase):
         self.assertEqual(order.product_id, product.id)
         self.assertEqual(order.quantity, 10)
         self.assertEqual(order.customer, 'Test Customer')
-        self.assertEqual(order.order_date, '2021-01-01')
+        self.assertEqual(order.order_date, date(2021, 1, 1))
+        self.assertEqual(order.serialize()['order_date'], '2021-01-01')
         self.assertEqual(order.status, 'open')
 
+    def test_serialize_rows(self):
+        """Test the row serializers match the model serializers."""
+        product = Product(
+            name='Test Product', brand='Test Brand', price=10.0, stock=100
+        )
+        db.session.add(product)
+        db.session.commit()
+
+        order = Order(
+            product_id=product.id,
+            quantity=10,
+            customer='Test Customer',
+            order_date=date(2021, 1, 1)
+        )
+        db.session.add(order)
+        db.session.commit()
+
+        product_row = db.session.execute(db.select(*PRODUCT_ROW_COLUMNS)).one()
+        order_row = db.session.execute(
+            db.select(*ORDER_ROW_COLUMNS).join(Order.product)
+        ).one()
+
+        self.assertEqual(serialize_product_row(product_row), product.serialize())
+        self.assertEqual(serialize_order_row(order_row), order.serialize())
+
+    def test_order_filter_uses_index(self):
+        """Test filtering orders by customer and status uses an index."""
+        query = db.select(Order).where(
+            Order.customer == 'Test Customer',
+            Order.status == 'open'
+        )
+        sql = query.compile(compile_kwargs={'literal_binds': True})
+        plan = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).all()
+
+        self.assertIn('ix_order_customer_status', str(plan))
+
+    def test_order_pages_read_in_index_order(self):
+        """Test filtered and sorted order pages need no sort of their own."""
+        filters = {
+            None: [],
+            'customer': [Order.customer == 'Test Customer'],
+            'status': [Order.status == 'open'],
+            'product_id': [Order.product_id == 1],
+            'customer+status': [
+                Order.customer == 'Test Customer', Order.status == 'open'
+            ],
+        }
+        sorts = {
+            'id': Order.id,
+            'customer': Order.customer,
+            'order_date': Order.order_date,
+            'status': Order.status,
+        }
+        cursor = {
+            Order.id: 1,
+            Order.customer: 'Test Customer',
+            Order.order_date: date(2021, 1, 1),
+            Order.status: 'open',
+        }
+        # Orders of a status or product are sorted by ID or date only, and
+        # sorting by a column fixed by a filter is the same as sorting by ID.
+        skipped = {
+            ('status', 'customer'),
+            ('product_id', 'customer'), ('product_id', 'status'),
+            ('customer+status', 'customer'), ('customer+status', 'status'),
+        }
+
+        for (filter_name, conditions), (sort_name, column) in itertools.product(
+            filters.items(), sorts.items()
+        ):
+            if (filter_name, sort_name) in skipped:
+                continue
+
+            keys = [Order.id] if column is Order.id else [column, Order.id]
+            position = db.tuple_(*keys) if len(keys) > 1 else keys[0]
+            bound = (
+                db.tuple_(*(cursor[key] for key in keys))
+                if len(keys) > 1 else cursor[Order.id]
+            )
+            for descending, after in itertools.product((False, True), repeat=2):
+                with self.subTest(
+                    filter=filter_name, sort=sort_name,
+                    descending=descending, after=after
+                ):
+                    query = (
+                        db.select(*ORDER_ROW_COLUMNS)
+                        .join(Order.product)
+                        .where(*conditions)
+                        .order_by(*(key.desc() if descending else key for key in keys))
+                        .limit(101)
+                    )
+                    if after:
+                        query = query.where(
+                            position < bound if descending else position > bound
+                        )
+                    sql = query.compile(compile_kwargs={'literal_binds': True})
+                    plan = str(db.session.execute(
+                        db.text(f'EXPLAIN QUERY PLAN {sql}')
+                    ).all())
+
+                    self.assertNotIn('TEMP B-TREE', plan)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,35 +1,43 @@
+import csv
+import io
 import json
+import re
 import sys
 import unittest
+from contextlib import contextmanager
 from pathlib import Path
 
+from sqlalchemy import event
+
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+from base import DatabaseTestCase
 from models import db
-from server import app
-
-
-class TestRoutes(unittest.TestCase):
-    def setUp(self):
-        """Set up test database and client."""
-        app.config.update({
-            'TESTING': True,
-            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
-            'SERVER_NAME': 'localhost',
-        })
-        self.app = app
-        self.client = app.test_client()
-        self.ctx = app.app_context()
-        self.ctx.push()
-        db.create_all()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        db.session.remove()
-        db.drop_all()
-        self.ctx.pop()
 
+SAVEPOINT_STATEMENT = re.compile(r'(RELEASE |ROLLBACK TO )?SAVEPOINT\b')
+
+
+@contextmanager
+def count_queries():
+    """
+    Count the SQL statements executed inside the block.
+
+    Savepoints are left out, they come from the per-test transaction.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if not SAVEPOINT_STATEMENT.match(statement):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+class TestRoutes(DatabaseTestCase):
     def test_get_products_empty(self):
         """Test GET /products with empty database."""
         response = self.client.get('/api/products')
@@ -80,6 +88,75 @@ class TestRoutes(unittest.TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['name'], product_data['name'])
 
+    def test_get_product(self):
+        """Test GET /products/<id>."""
+        product_data = {
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 99.99,
+            "stock": 10
+        }
+        response = self.client.post('/api/products', json=product_data)
+        product_id = json.loads(response.data)['id']
+
+        response = self.client.get(f'/api/products/{product_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.data), {"id": product_id, **product_data}
+        )
+
+        response = self.client.get(
+            f'/api/products/{product_id}',
+            headers={'If-None-Match': response.headers['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(f'/api/products/{product_id + 1}')
+        self.assertEqual(response.status_code, 404)
+
+    def test_search_products(self):
+        """Test GET /products/search."""
+        for name, brand in [
+            ("Widget", "Acme"),
+            ("wide Screen", "Zeta"),
+            ("Gadget", "Widely"),
+            ("Bolt", "Acme"),
+            ("100% Wool", "Knit"),
+        ]:
+            self.client.post('/api/products', json={
+                "name": name, "brand": brand, "price": 1.0, "stock": 1
+            })
+
+        response = self.client.get('/api/products/search?q=WID')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [product['name'] for product in json.loads(response.data)],
+            ["Gadget", "wide Screen", "Widget"]
+        )
+
+        response = self.client.get(
+            '/api/products/search?q=WID',
+            headers={'If-None-Match': response.headers['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get('/api/products/search?q=wid&limit=1')
+        self.assertEqual(
+            [product['name'] for product in json.loads(response.data)],
+            ["Gadget"]
+        )
+
+        # Wildcards in the prefix are matched literally.
+        response = self.client.get('/api/products/search?q=100%25')
+        self.assertEqual(len(json.loads(response.data)), 1)
+        response = self.client.get('/api/products/search?q=_')
+        self.assertEqual(json.loads(response.data), [])
+
+        response = self.client.get('/api/products/search')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/products/search?q=w&limit=0')
+        self.assertEqual(response.status_code, 400)
+
     def test_update_product(self):
         """Test PUT /products/<id>."""
         product_data = {
@@ -154,6 +231,44 @@ class TestRoutes(unittest.TestCase):
         products = json.loads(product_response.data)
         self.assertEqual(products[0]['stock'], 8)
 
+    def test_get_order(self):
+        """Test GET /orders/<id>."""
+        product_response = self.client.post('/api/products', json={
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        product = json.loads(product_response.data)
+        response = self.client.post('/api/orders', json={
+            "product_id": product['id'],
+            "quantity": 2,
+            "customer": "Test Customer",
+            "order_date": "2023-09-20"
+        })
+        order = json.loads(response.data)
+
+        response = self.client.get(f'/api/orders/{order["id"]}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), order)
+        etag = response.headers['ETag']
+
+        # The product is embedded, so its changes count as well.
+        self.client.put(f'/api/products/{product["id"]}', json={
+            **{key: product[key] for key in ('brand', 'price', 'stock')},
+            "name": "Renamed Product"
+        })
+        response = self.client.get(
+            f'/api/orders/{order["id"]}', headers={'If-None-Match': etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.data)['product']['name'], "Renamed Product"
+        )
+
+        response = self.client.get(f'/api/orders/{order["id"] + 1}')
+        self.assertEqual(response.status_code, 404)
+
     def test_update_order(self):
         """Test PUT /orders/<id>."""
         product_data = {
@@ -220,5 +335,688 @@ class TestRoutes(unittest.TestCase):
         products = json.loads(product_response.data)
         self.assertEqual(products[0]['stock'], 10)
 
+    def test_get_orders_query_count(self):
+        """Test GET /orders loads products without an N+1 query pattern."""
+        for i in range(3):
+            product_response = self.client.post('/api/products', json={
+                "name": f"Product {i}",
+                "brand": "Test Brand",
+                "price": 9.99,
+                "stock": 10
+            })
+            product_id = json.loads(product_response.data)['id']
+            for _ in range(2):
+                self.client.post('/api/orders', json={
+                    "product_id": product_id,
+                    "quantity": 1,
+                    "customer": "Test Customer",
+                    "order_date": "2023-09-20"
+                })
+        db.session.remove()
+
+        with count_queries() as statements:
+            response = self.client.get('/api/orders')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len(data), 6)
+        self.assertEqual(
+            {order['product']['name'] for order in data},
+            {"Product 0", "Product 1", "Product 2"}
+        )
+        # One SELECT for the table versions of the ETag, one for the orders.
+        self.assertEqual(len(statements), 2)
+
+    def test_get_conditional(self):
+        """Test GET /products and /orders answer If-None-Match with 304."""
+        product_data = {
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        }
+        product_response = self.client.post('/api/products', json=product_data)
+        product_id = json.loads(product_response.data)['id']
+        self.client.post('/api/orders', json={
+            "product_id": product_id,
+            "quantity": 1,
+            "customer": "Test Customer",
+            "order_date": "2023-09-20"
+        })
+
+        for url in ('/api/products', '/api/orders', '/api/orders?limit=1'):
+            response = self.client.get(url)
+            etag = response.headers['ETag']
+
+            with count_queries() as statements:
+                response = self.client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b'')
+            self.assertEqual(len(statements), 1)
+
+        # Different query strings are different representations.
+        self.assertNotEqual(
+            self.client.get('/api/orders').headers['ETag'],
+            self.client.get('/api/orders?limit=1').headers['ETag']
+        )
+
+        # Product changes show up in the embedded products of orders.
+        orders_etag = self.client.get('/api/orders').headers['ETag']
+        product_data['name'] = "Renamed Product"
+        self.client.put(f'/api/products/{product_id}', json=product_data)
+
+        response = self.client.get(
+            '/api/orders', headers={'If-None-Match': orders_etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], orders_etag)
+        self.assertEqual(
+            json.loads(response.data)[0]['product']['name'], "Renamed Product"
+        )
+
+    def test_get_products_cached(self):
+        """Test GET /products serves repeated reads from the product cache."""
+        product_data = {
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        }
+        product_response = self.client.post('/api/products', json=product_data)
+        product_id = json.loads(product_response.data)['id']
+
+        before = json.loads(self.client.get('/api/cache/stats').data)['products']
+        self.client.get('/api/products')
+        with count_queries() as statements:
+            response = self.client.get('/api/products')
+        self.assertEqual(len(json.loads(response.data)), 1)
+        # Only the table versions are read.
+        self.assertEqual(len(statements), 1)
+
+        stats = json.loads(self.client.get('/api/cache/stats').data)['products']
+        self.assertEqual(stats['hits'] - before['hits'], 1)
+        self.assertEqual(stats['misses'] - before['misses'], 1)
+
+        # Orders take stock, which must show up right away.
+        self.client.post('/api/orders', json={
+            "product_id": product_id,
+            "quantity": 3,
+            "customer": "Test Customer",
+            "order_date": "2023-09-20"
+        })
+        response = self.client.get('/api/products')
+        self.assertEqual(json.loads(response.data)[0]['stock'], 7)
+
+        product_data['name'] = "Renamed Product"
+        self.client.put(f'/api/products/{product_id}', json=product_data)
+        response = self.client.get('/api/products')
+        self.assertEqual(json.loads(response.data)[0]['name'], "Renamed Product")
+
+    def test_sync(self):
+        """Test GET /sync returns the changes after a revision."""
+        product_data = {
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        }
+        product_ids = [
+            json.loads(self.client.post('/api/products', json=product_data).data)['id']
+            for _ in range(2)
+        ]
+        order_data = {
+            "product_id": product_ids[0],
+            "quantity": 1,
+            "customer": "Test Customer",
+            "order_date": "2023-09-20"
+        }
+        order_ids = [
+            json.loads(self.client.post('/api/orders', json=order_data).data)['id']
+            for _ in range(2)
+        ]
+
+        response = self.client.get('/api/sync')
+        self.assertEqual(response.status_code, 200)
+        changes = json.loads(response.data)
+        self.assertEqual(changes['revision'], 4)
+        self.assertEqual([p['id'] for p in changes['products']], product_ids)
+        self.assertEqual([o['id'] for o in changes['orders']], order_ids)
+        self.assertEqual(changes['deleted'], {'products': [], 'orders': []})
+
+        product_data['name'] = "Renamed Product"
+        self.client.put(f'/api/products/{product_ids[1]}', json=product_data)
+        self.client.delete(f'/api/orders/{order_ids[0]}')
+
+        response = self.client.get(f"/api/sync?since={changes['revision']}")
+        changes = json.loads(response.data)
+        self.assertEqual(changes['revision'], 6)
+        # The deleted order gave its stock back to the first product.
+        self.assertEqual([p['id'] for p in changes['products']], product_ids)
+        self.assertEqual(changes['products'][0]['stock'], 9)
+        self.assertEqual(changes['products'][1]['name'], "Renamed Product")
+        self.assertEqual(changes['orders'], [])
+        self.assertEqual(changes['deleted'], {'products': [], 'orders': [order_ids[0]]})
+
+        response = self.client.get('/api/sync?since=6&tables=products')
+        changes = json.loads(response.data)
+        self.assertEqual(changes, {
+            'revision': 6, 'products': [], 'deleted': {'products': []}
+        })
+
+        for query in ('since=7', 'since=-1', 'since=abc', 'tables=customers'):
+            response = self.client.get(f'/api/sync?{query}')
+            self.assertEqual(response.status_code, 400)
+
+    def test_get_revision(self):
+        """Test GET /sync/revision returns only the current revision."""
+        response = self.client.get('/api/sync/revision')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), {'revision': 0})
+
+        product_data = {
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        }
+        self.client.post('/api/products', json=product_data)
+
+        response = self.client.get('/api/sync/revision')
+        self.assertEqual(json.loads(response.data), {'revision': 1})
+
+    def test_stream_events(self):
+        """Test GET /events announces the revisions after the start."""
+        self.app.config.update(EVENT_STREAM_DURATION=0.2, EVENT_POLL_INTERVAL=0.05)
+        self.addCleanup(self.app.config.pop, 'EVENT_STREAM_DURATION')
+        self.addCleanup(self.app.config.pop, 'EVENT_POLL_INTERVAL')
+
+        product_data = {
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        }
+        for _ in range(2):
+            self.client.post('/api/products', json=product_data)
+
+        response = self.client.get('/api/events')
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        self.assertNotIn('event: change', response.data.decode())
+
+        response = self.client.get('/api/events', headers={'Last-Event-ID': '1'})
+        events = [
+            event for event in response.data.decode().split('\n\n')
+            if event.startswith('id:')
+        ]
+        self.assertEqual(len(events), 1)
+        event_id, event_type, data = events[0].split('\n')
+        self.assertEqual(event_id, 'id: 2')
+        self.assertEqual(event_type, 'event: change')
+        self.assertEqual(
+            json.loads(data.removeprefix('data: ')),
+            {'revision': 2, 'tables': ['products', 'orders']}
+        )
+
+        response = self.client.get('/api/events?since=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_events_limit(self):
+        """Test GET /events refuses streams beyond MAX_EVENT_STREAMS."""
+        # Streams of other tests are released once their responses are
+        # closed, allow one more than those.
+        open_streams = self.app.extensions['stream_slots'].open
+        self.app.config.update(
+            EVENT_STREAM_DURATION=0.2, MAX_EVENT_STREAMS=open_streams + 1
+        )
+        self.addCleanup(self.app.config.pop, 'EVENT_STREAM_DURATION')
+        self.addCleanup(self.app.config.pop, 'MAX_EVENT_STREAMS')
+
+        stream = self.client.get('/api/events', buffered=False)
+        self.assertEqual(stream.status_code, 200)
+
+        response = self.client.get('/api/events')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response.headers)
+
+        stream.close()
+        response = self.client.get('/api/events')
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_products_paginated(self):
+        """Test GET /products walks all products page by page."""
+        for i in range(5):
+            self.client.post('/api/products', json={
+                "name": f"Product {i}",
+                "brand": "Test Brand",
+                "price": 9.99,
+                "stock": 10
+            })
+
+        names = []
+        after = None
+        pages = 0
+        while True:
+            params = {'limit': 2}
+            if after:
+                params['after'] = after
+            response = self.client.get('/api/products', query_string=params)
+            self.assertEqual(response.status_code, 200)
+            page = json.loads(response.data)
+            names.extend(product['name'] for product in page['items'])
+            pages += 1
+            after = page['next_cursor']
+            if after is None:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(names, [f"Product {i}" for i in range(5)])
+
+    def test_get_orders_paginated(self):
+        """Test GET /orders returns a page and a cursor to the next one."""
+        product_response = self.client.post('/api/products', json={
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        product_id = json.loads(product_response.data)['id']
+        for i in range(3):
+            self.client.post('/api/orders', json={
+                "product_id": product_id,
+                "quantity": 1,
+                "customer": f"Customer {i}",
+                "order_date": "2023-09-20"
+            })
+
+        response = self.client.get('/api/orders?limit=2')
+        self.assertEqual(response.status_code, 200)
+        page = json.loads(response.data)
+        self.assertEqual(
+            [order['customer'] for order in page['items']],
+            ["Customer 0", "Customer 1"]
+        )
+        self.assertIsNotNone(page['next_cursor'])
+
+        response = self.client.get(
+            '/api/orders',
+            query_string={'limit': 2, 'after': page['next_cursor']}
+        )
+        page = json.loads(response.data)
+        self.assertEqual(
+            [order['customer'] for order in page['items']],
+            ["Customer 2"]
+        )
+        self.assertIsNone(page['next_cursor'])
+
+    def test_get_products_paginated_invalid(self):
+        """Test GET /products with invalid pagination parameters."""
+        for query in ('limit=0', 'limit=abc', 'limit=100000', 'after=%%%'):
+            response = self.client.get(f'/api/products?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_get_orders_filtered(self):
+        """Test GET /orders with filters."""
+        product_ids = []
+        for i in range(2):
+            product_response = self.client.post('/api/products', json={
+                "name": f"Product {i}",
+                "brand": "Test Brand",
+                "price": 9.99,
+                "stock": 10
+            })
+            product_ids.append(json.loads(product_response.data)['id'])
+
+        orders = [
+            (product_ids[0], "Alice", "2023-09-01"),
+            (product_ids[1], "Alice", "2023-09-15"),
+            (product_ids[0], "Bob", "2023-09-20"),
+            (product_ids[1], "Bob", "2023-10-01"),
+        ]
+        for product_id, customer, order_date in orders:
+            self.client.post('/api/orders', json={
+                "product_id": product_id,
+                "quantity": 1,
+                "customer": customer,
+                "order_date": order_date
+            })
+
+        def customers(query_string):
+            response = self.client.get('/api/orders', query_string=query_string)
+            self.assertEqual(response.status_code, 200)
+            return [
+                (order['customer'], order['order_date'])
+                for order in json.loads(response.data)
+            ]
+
+        self.assertEqual(
+            customers({'customer': 'Alice', 'status': 'open'}),
+            [("Alice", "2023-09-01"), ("Alice", "2023-09-15")]
+        )
+        self.assertEqual(customers({'status': 'closed'}), [])
+        self.assertEqual(
+            customers({'product_id': product_ids[1]}),
+            [("Alice", "2023-09-15"), ("Bob", "2023-10-01")]
+        )
+        self.assertEqual(
+            customers({
+                'order_date_from': '2023-09-15',
+                'order_date_to': '2023-09-30'
+            }),
+            [("Alice", "2023-09-15"), ("Bob", "2023-09-20")]
+        )
+
+    def test_get_orders_search(self):
+        """Test GET /orders with a free-text search."""
+        product_ids = []
+        for name in ("Red Chair", "Blue_Table"):
+            product_response = self.client.post('/api/products', json={
+                "name": name,
+                "brand": "Test Brand",
+                "price": 9.99,
+                "stock": 10
+            })
+            product_ids.append(json.loads(product_response.data)['id'])
+
+        order_ids = []
+        for product_id, customer in (
+            (product_ids[0], "ACME Corp"),
+            (product_ids[1], "Acme Corp"),
+            (product_ids[0], "Globex"),
+        ):
+            response = self.client.post('/api/orders', json={
+                "product_id": product_id,
+                "quantity": 1,
+                "customer": customer,
+                "order_date": "2023-09-20"
+            })
+            order_ids.append(json.loads(response.data)['id'])
+
+        def search(query):
+            response = self.client.get(
+                '/api/orders', query_string={'search': query, 'limit': 10}
+            )
+            self.assertEqual(response.status_code, 200)
+            return [order['id'] for order in json.loads(response.data)['items']]
+
+        self.assertEqual(search('acme'), order_ids[:2])
+        self.assertEqual(search('corp acm'), order_ids[:2])
+        self.assertEqual(search('chair'), [order_ids[0], order_ids[2]])
+        self.assertEqual(search('acme chair'), [order_ids[0]])
+        self.assertEqual(search(str(order_ids[2])), [order_ids[2]])
+        # Words only match from their start, and wildcards are literal.
+        self.assertEqual(search('cme'), [])
+        self.assertEqual(search('blue_'), [order_ids[1]])
+        self.assertEqual(search('blue%'), [])
+
+    def test_get_orders_sorted_paginated(self):
+        """Test GET /orders sorted by a column across several pages."""
+        product_response = self.client.post('/api/products', json={
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        product_id = json.loads(product_response.data)['id']
+        for order_date in ("2023-09-02", "2023-09-01", "2023-09-02", "2023-09-03"):
+            self.client.post('/api/orders', json={
+                "product_id": product_id,
+                "quantity": 1,
+                "customer": "Test Customer",
+                "order_date": order_date
+            })
+
+        ids = []
+        after = None
+        while True:
+            params = {'sort': '-order_date', 'limit': 1}
+            if after:
+                params['after'] = after
+            response = self.client.get('/api/orders', query_string=params)
+            self.assertEqual(response.status_code, 200)
+            page = json.loads(response.data)
+            ids.extend(order['id'] for order in page['items'])
+            after = page['next_cursor']
+            if after is None:
+                break
+
+        self.assertEqual(ids, [4, 3, 1, 2])
+
+    def test_get_orders_invalid_query(self):
+        """Test GET /orders with an invalid sort key and filter."""
+        response = self.client.get('/api/orders?sort=quantity')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get('/api/orders?product_id=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_orders(self):
+        """Test GET /orders/export as NDJSON and CSV."""
+        product_response = self.client.post('/api/products', json={
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        product_id = json.loads(product_response.data)['id']
+        for customer in ("Alice", "Bob", "Alice"):
+            self.client.post('/api/orders', json={
+                "product_id": product_id,
+                "quantity": 1,
+                "customer": customer,
+                "order_date": "2023-09-20"
+            })
+        orders = json.loads(self.client.get('/api/orders').data)
+
+        response = self.client.get('/api/orders/export')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(
+            [json.loads(line) for line in response.data.decode().splitlines()],
+            orders
+        )
+
+        response = self.client.get(
+            '/api/orders/export?format=csv&customer=Alice&sort=-id'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        self.assertEqual([row['id'] for row in rows], ['3', '1'])
+        self.assertEqual(rows[0]['product_name'], "Test Product")
+        self.assertEqual(rows[0]['order_date'], "2023-09-20")
+
+        response = self.client.get('/api/orders/export?format=xml')
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_order_invalid_date(self):
+        """Test POST and PUT /orders reject invalid order dates."""
+        product_response = self.client.post('/api/products', json={
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        product_id = json.loads(product_response.data)['id']
+        order_data = {
+            "product_id": product_id,
+            "quantity": 1,
+            "customer": "Test Customer",
+            "order_date": "20.09.2023"
+        }
+
+        response = self.client.post('/api/orders', json=order_data)
+        self.assertEqual(response.status_code, 400)
+
+        order_data['order_date'] = "2023-09-20"
+        order_response = self.client.post('/api/orders', json=order_data)
+        order_id = json.loads(order_response.data)['id']
+
+        order_data['order_date'] = "2023-02-30"
+        response = self.client.put(f'/api/orders/{order_id}', json=order_data)
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get('/api/orders?order_date_from=yesterday')
+        self.assertEqual(response.status_code, 400)
+
+        for value in ("20230920", "2023-W38-3"):
+            order_data['order_date'] = value
+            response = self.client.post('/api/orders', json=order_data)
+            self.assertEqual(response.status_code, 400)
+
+    def test_bulk_products(self):
+        """Test POST /products/bulk."""
+        response = self.client.post('/api/products', json={
+            "name": "Old Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        old_id = json.loads(response.data)['id']
+        response = self.client.post('/api/products', json={
+            "name": "Updated Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        updated_id = json.loads(response.data)['id']
+
+        creates = [
+            {"name": f"Product {i}", "brand": "Bulk", "price": 1.5, "stock": i}
+            for i in range(100)
+        ]
+        with count_queries() as statements:
+            response = self.client.post('/api/products/bulk', json={
+                "create": creates,
+                "update": [{
+                    "id": updated_id,
+                    "name": "Updated Product",
+                    "brand": "Test Brand",
+                    "price": 19.99,
+                    "stock": 5
+                }],
+                "delete": [old_id]
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(len(statements), 10)
+
+        data = json.loads(response.data)
+        self.assertEqual(
+            [product['name'] for product in data['created']],
+            [product['name'] for product in creates]
+        )
+        self.assertEqual(data['updated'][0]['price'], 19.99)
+        self.assertEqual(data['deleted'], [old_id])
+
+        response = self.client.get('/api/products')
+        products = json.loads(response.data)
+        self.assertEqual(len(products), 101)
+        self.assertNotIn(old_id, [product['id'] for product in products])
+
+    def test_bulk_products_invalid(self):
+        """Test POST /products/bulk applies nothing if an item is invalid."""
+        response = self.client.post('/api/products/bulk', json={
+            "create": [
+                {"name": "Valid", "brand": "Bulk", "price": 1.5, "stock": 1},
+                {"name": "Free", "brand": "Bulk", "price": 0, "stock": 1},
+            ],
+            "update": [{"name": "No ID"}],
+            "delete": [42]
+        })
+        self.assertEqual(response.status_code, 400)
+        errors = json.loads(response.data)['errors']
+        self.assertEqual(
+            [(error['operation'], error['index']) for error in errors],
+            [('create', 1), ('update', 0), ('delete', 0)]
+        )
+
+        response = self.client.get('/api/products')
+        self.assertEqual(json.loads(response.data), [])
+
+    def test_bulk_orders(self):
+        """Test POST /orders/bulk adjusts stock once per product."""
+        response = self.client.post('/api/products', json={
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        product_id = json.loads(response.data)['id']
+        response = self.client.post('/api/orders', json={
+            "product_id": product_id,
+            "quantity": 4,
+            "customer": "Old Customer",
+            "order_date": "2023-09-20"
+        })
+        old_id = json.loads(response.data)['id']
+
+        order = {
+            "product_id": product_id,
+            "quantity": 3,
+            "customer": "Test Customer",
+            "order_date": "2023-09-21"
+        }
+        response = self.client.post('/api/orders/bulk', json={
+            "create": [order] * 3,
+            "delete": [old_id]
+        })
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len(data['created']), 3)
+        self.assertEqual(data['created'][0]['product']['id'], product_id)
+        self.assertEqual(data['created'][0]['order_date'], "2023-09-21")
+
+        response = self.client.get('/api/products')
+        self.assertEqual(json.loads(response.data)[0]['stock'], 1)
+
+        response = self.client.post('/api/orders/bulk', json={
+            "create": [order, {**order, "product_id": 42}]
+        })
+        self.assertEqual(response.status_code, 400)
+        errors = json.loads(response.data)['errors']
+        self.assertEqual(len(errors), 2)
+        self.assertIn("Insufficient stock", errors[0]['message'])
+        self.assertIn("not found", errors[1]['message'])
+
+        response = self.client.get('/api/orders')
+        self.assertEqual(len(json.loads(response.data)), 3)
+
+    def test_bulk_orders_invalid_status(self):
+        """Test POST /orders/bulk rejects an invalid status per item."""
+        response = self.client.post('/api/products', json={
+            "name": "Test Product",
+            "brand": "Test Brand",
+            "price": 9.99,
+            "stock": 10
+        })
+        product_id = json.loads(response.data)['id']
+        order = {
+            "product_id": product_id,
+            "quantity": 1,
+            "customer": "Test Customer",
+            "order_date": "2023-09-21"
+        }
+        response = self.client.post('/api/orders', json=order)
+        order_id = json.loads(response.data)['id']
+
+        response = self.client.post('/api/orders/bulk', json={
+            "create": [
+                {**order, "status": "shipped"},
+                {**order, "status": ["open"]},
+                {**order, "status": ""},
+            ],
+            "update": [{**order, "id": order_id, "status": "x" * 21}]
+        })
+        self.assertEqual(response.status_code, 400)
+        errors = json.loads(response.data)['errors']
+        self.assertEqual(
+            [(error['operation'], error['index']) for error in errors],
+            [('create', 1), ('create', 2), ('update', 0)]
+        )
+        self.assertIn("Status", errors[0]['message'])
+
+        response = self.client.get('/api/orders')
+        self.assertEqual(len(json.loads(response.data)), 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,27 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from server import create_app
+
+
+class TestServer(unittest.TestCase):
+    def test_create_app(self):
+        """Test the app factory applies the config overrides."""
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        })
+
+        self.assertFalse(app.debug)
+        self.assertTrue(app.testing)
+        self.assertEqual(app.config['SQLALCHEMY_DATABASE_URI'], 'sqlite:///:memory:')
+        self.assertEqual(app.config['SQLITE_PRAGMAS']['journal_mode'], 'WAL')
+
+        response = app.test_client().get('/api/products')
+        self.assertEqual(response.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,179 @@
-from typing import Any, Dict, List
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_URL = 'http://localhost:5000/api'
+PAGE_SIZE = 100
+# Products returned by a product search.
+SEARCH_LIMIT = 20
+# (connect, read) timeout of a request in seconds.
+REQUEST_TIMEOUT = (3.05, 30)
+# Retries of idempotent requests on connection errors and 502/503/504, with
+# a delay of RETRY_BACKOFF * 2 ** (retry - 1) seconds before each retry.
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.2
+# Connections kept open to the server, at least one per worker thread.
+POOL_SIZE = 10
+# Seconds without a line after which an event stream counts as dead. The
+# server sends keep-alives every few seconds.
+EVENT_READ_TIMEOUT = 30
+
+# Responses kept for conditional GETs, least recently used ones are dropped.
+RESPONSE_CACHE_SIZE = 32
+
+# Last response of recent conditional GETs, by URL and query parameters:
+# (ETag, decoded JSON body).
+_response_cache: OrderedDict[
+    Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[str, Any]
+] = OrderedDict()
+# API calls run in worker threads, which share the cache.
+_response_cache_lock = threading.Lock()
+
+
+class ApiClient:
+    """
+    HTTP client shared by all API calls.
+
+    Requests go through one persistent session, so connections to the
+    server are pooled and kept alive instead of opening a new one per call.
+    Every request gets a timeout, and idempotent requests (GET, PUT, DELETE)
+    are retried with exponential backoff when the connection fails or the
+    server is unavailable. POST requests are never retried, as they are not
+    safe to send twice. Event streams are opened through a separate session
+    without retries, see stream().
+
+    The connection pool is thread-safe and the session is not modified
+    after creation, so one client is shared by the GUI and worker threads.
+    """
+    def __init__(
+        self,
+        timeout: Tuple[float, float] = REQUEST_TIMEOUT,
+        retries: int = MAX_RETRIES,
+        backoff: float = RETRY_BACKOFF,
+        pool_size: int = POOL_SIZE
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            timeout (tuple): Default (connect, read) timeout in seconds.
+            retries (int): Maximum retries of an idempotent request.
+            backoff (float): Backoff factor of the retry delay in seconds.
+            pool_size (int): Connections kept open per host.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({'GET', 'PUT', 'DELETE', 'HEAD'}),
+                raise_on_status=False
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # A refused stream must fail at once: retrying a 503 would block for
+        # its Retry-After, and the caller reconnects with its own backoff.
+        self.stream_session = requests.Session()
+        stream_adapter = HTTPAdapter(pool_connections=1, max_retries=Retry(0))
+        self.stream_session.mount('http://', stream_adapter)
+        self.stream_session.mount('https://', stream_adapter)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request, with the default timeout unless one is given."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a PUT request."""
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a DELETE request."""
+        return self.request('DELETE', url, **kwargs)
+
+    def stream(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a streaming GET request, which is never retried."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.stream_session.get(url, stream=True, **kwargs)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+        self.stream_session.close()
+
+
+client = ApiClient()
 
 def get_products() -> List[Dict[str, Any]]:
     """Get all products."""
     try:
-        response = requests.get(f'{API_URL}/products')
+        products = _get_json(f'{API_URL}/products')
+        return products if products is not None else []
+    except Exception as e:
+        return [{ "message": str(e) }]
+
+def get_product(product_id: int) -> Dict[str, Any]:
+    """Get a product."""
+    try:
+        product = _get_json(f'{API_URL}/products/{product_id}')
+        return product if product is not None else {}
+    except Exception as e:
+        return { "message": str(e) }
+
+def search_products(
+    prefix: str,
+    limit: int = SEARCH_LIMIT
+) -> List[Dict[str, Any]]:
+    """
+    Get the products whose name or brand starts with a prefix.
+
+    Results are not kept in the conditional request cache, which would
+    grow with every search typed; ``ui.completer`` caches them instead.
+    """
+    try:
+        response = client.get(
+            f'{API_URL}/products/search',
+            params={'q': prefix, 'limit': limit}
+        )
         return response.json() if response.status_code == 200 else []
     except Exception as e:
         return [{ "message": str(e) }]
 
+def get_products_page(
+    limit: int = PAGE_SIZE,
+    after: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get one page of products."""
+    return _get_page(f'{API_URL}/products', limit, after)
+
+def iter_products(limit: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+    """Iterate over all products, fetching one page at a time."""
+    return _iter_pages(get_products_page, limit)
+
 def create_product(product: Dict[str, Any]) -> Dict[str, Any]:
     """Create a product."""
     try:
-        response = requests.post(f'{API_URL}/products', json=product)
+        response = client.post(f'{API_URL}/products', json=product)
         return response.json() if response.status_code == 201 else {}
     except Exception as e:
         return { "message": str(e) }
@@ -23,7 +181,7 @@ def create_product(product: Dict[str, Any]) -> Dict[str, Any]:
 def update_product(product_id: int, product: Dict[str, Any]) -> Dict[str, Any]:
     """Update a product."""
     try:
-        response = requests.put(f'{API_URL}/products/{product_id}', json=product)
+        response = client.put(f'{API_URL}/products/{product_id}', json=product)
         return response.json() if response.status_code == 200 else {}
     except Exception as e:
         return { "message": str(e) }
@@ -31,7 +189,7 @@ def update_product(product_id: int, product: Dict[str, Any]) -> Dict[str, Any]:
 def delete_product(product_id: int) -> Dict[str, Any]:
     """Delete a product."""
     try:
-        response = requests.delete(f'{API_URL}/products/{product_id}')
+        response = client.delete(f'{API_URL}/products/{product_id}')
         return response.json() if response.status_code == 200 else {}
     except Exception as e:
         return { "message": str(e) }
@@ -39,15 +197,62 @@ def delete_product(product_id: int) -> Dict[str, Any]:
 def get_orders() -> List[Dict[str, Any]]:
     """Get all orders."""
     try:
-        response = requests.get(f'{API_URL}/orders')
-        return response.json() if response.status_code == 200 else []
+        orders = _get_json(f'{API_URL}/orders')
+        return orders if orders is not None else []
     except Exception as e:
         return [{ "message": str(e) }]
 
+def get_order(order_id: int) -> Dict[str, Any]:
+    """Get an order."""
+    try:
+        order = _get_json(f'{API_URL}/orders/{order_id}')
+        return order if order is not None else {}
+    except Exception as e:
+        return { "message": str(e) }
+
+def bulk_products(
+    create: Optional[List[Dict[str, Any]]] = None,
+    update: Optional[List[Dict[str, Any]]] = None,
+    delete: Optional[List[int]] = None
+) -> Dict[str, Any]:
+    """
+    Create, update and delete many products in one request.
+
+    Returns the created, updated and deleted products, or the per-item
+    ``errors`` if the batch was rejected.
+    """
+    return _bulk(f'{API_URL}/products/bulk', create, update, delete)
+
+def get_orders_page(
+    limit: int = PAGE_SIZE,
+    after: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of orders.
+
+    Args:
+        limit (int): Page size.
+        after (str): Cursor of the previous page.
+        filters (dict): Server-side filters and sort key, e.g.
+            ``{"customer": "ACME", "status": "open", "sort": "-order_date"}``.
+    """
+    return _get_page(f'{API_URL}/orders', limit, after, filters)
+
+def iter_orders(
+    limit: int = PAGE_SIZE,
+    filters: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Iterate over all (matching) orders, fetching one page at a time."""
+    return _iter_pages(
+        lambda limit, after: get_orders_page(limit, after, filters),
+        limit
+    )
+
 def create_order(order: Dict[str, Any]) -> Dict[str, Any]:
     """Create an order."""
     try:
-        response = requests.post(f'{API_URL}/orders', json=order)
+        response = client.post(f'{API_URL}/orders', json=order)
         return response.json() if response.status_code == 201 else {}
     except Exception as e:
         return { "message": str(e) }
@@ -55,7 +260,7 @@ def create_order(order: Dict[str, Any]) -> Dict[str, Any]:
 def update_order(order_id: int, order: Dict[str, Any]) -> Dict[str, Any]:
     """Update an order."""
     try:
-        response = requests.put(f'{API_URL}/orders/{order_id}', json=order)
+        response = client.put(f'{API_URL}/orders/{order_id}', json=order)
         return response.json() if response.status_code == 200 else {}
     except Exception as e:
         return { "message": str(e) }
@@ -63,7 +268,212 @@ def update_order(order_id: int, order: Dict[str, Any]) -> Dict[str, Any]:
 def delete_order(order_id: int) -> Dict[str, Any]:
     """Delete an order."""
     try:
-        response = requests.delete(f'{API_URL}/orders/{order_id}')
+        response = client.delete(f'{API_URL}/orders/{order_id}')
         return response.json() if response.status_code == 200 else {}
     except Exception as e:
         return { "message": str(e) }
+
+def bulk_orders(
+    create: Optional[List[Dict[str, Any]]] = None,
+    update: Optional[List[Dict[str, Any]]] = None,
+    delete: Optional[List[int]] = None
+) -> Dict[str, Any]:
+    """
+    Create, update and delete many orders in one request.
+
+    Returns the created, updated and deleted orders, or the per-item
+    ``errors`` if the batch was rejected.
+    """
+    return _bulk(f'{API_URL}/orders/bulk', create, update, delete)
+
+def sync(since: int = 0, tables: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Get the products and orders changed after a revision.
+
+    Args:
+        since (int): ``revision`` of the previous sync, 0 for everything.
+        tables (list): Subset of ``products`` and ``orders`` to sync.
+
+    Returns the changed rows, the IDs of deleted rows under ``deleted`` and
+    the new ``revision``, or a ``message`` if the sync failed.
+    """
+    params: Dict[str, Any] = {'since': since}
+    if tables:
+        params['tables'] = ','.join(tables)
+
+    try:
+        response = client.get(f'{API_URL}/sync', params=params)
+        data = response.json()
+        return data if response.status_code == 200 else {
+            "message": data.get('message', 'Sync failed')
+        }
+    except Exception as e:
+        return { "message": str(e) }
+
+def get_revision() -> Dict[str, Any]:
+    """
+    Get the current revision to start delta syncs from.
+
+    Returns ``{"revision": ...}``, or a ``message`` if the request failed.
+    """
+    try:
+        response = client.get(f'{API_URL}/sync/revision')
+        data = response.json()
+        return data if response.status_code == 200 else {
+            "message": data.get('message', 'Failed to get revision')
+        }
+    except Exception as e:
+        return { "message": str(e) }
+
+def iter_events(
+    last_event_id: Optional[str] = None,
+    stop: Optional[threading.Event] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the change events of the server.
+
+    Every event is a dict with the event ``id``, its type under ``event``
+    and the decoded ``data``. The iteration ends when the server closes the
+    stream or ``stop`` is set. Connection errors and refused streams, e.g.
+    a ``503`` while the server has no stream to spare, are raised right away
+    for the caller to retry later.
+
+    Args:
+        last_event_id (str): ID of the last event seen, e.g. the revision of
+            the last sync, so no change in between is missed.
+        stop (threading.Event): Set to end the iteration from another thread.
+    """
+    headers = {'Accept': 'text/event-stream'}
+    if last_event_id:
+        headers['Last-Event-ID'] = last_event_id
+
+    with client.stream(
+        f'{API_URL}/events',
+        headers=headers,
+        timeout=(5, EVENT_READ_TIMEOUT)
+    ) as response:
+        response.raise_for_status()
+
+        event: Dict[str, Any] = {}
+        for line in response.iter_lines(decode_unicode=True):
+            if stop is not None and stop.is_set():
+                return
+
+            if not line:
+                if 'data' in event:
+                    yield event
+                event = {}
+            elif not line.startswith(':'):
+                field, _, value = line.partition(':')
+                value = value.removeprefix(' ')
+                if field == 'data':
+                    event['data'] = json.loads(value)
+                elif field in ('id', 'event'):
+                    event[field] = value
+
+def _get_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    conditional: bool = True
+) -> Any:
+    """
+    Send a conditional GET request and decode the JSON response.
+
+    The ETag of the last response is sent back as ``If-None-Match``; if the
+    server answers 304, the cached body of that response is reused, so
+    callers must not modify the returned data. Only the last
+    RESPONSE_CACHE_SIZE responses are kept.
+
+    Args:
+        url (str): URL to get.
+        params (dict): Query parameters.
+        conditional (bool): Whether to cache the response for the next
+            request, a plain GET otherwise.
+
+    Returns:
+        The decoded body, or None if the request failed.
+    """
+    if not conditional:
+        response = client.get(url, params=params)
+        return response.json() if response.status_code == 200 else None
+
+    key = (url, tuple(sorted((params or {}).items())))
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+    headers = {'If-None-Match': cached[0]} if cached else {}
+
+    response = client.get(url, params=params, headers=headers)
+    if response.status_code == 304 and cached:
+        data = cached[1]
+    elif response.status_code == 200:
+        data = response.json()
+        etag = response.headers.get('ETag')
+        cached = (etag, data) if etag else None
+    else:
+        return None
+
+    with _response_cache_lock:
+        if cached:
+            _response_cache[key] = cached
+            _response_cache.move_to_end(key)
+            while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        else:
+            _response_cache.pop(key, None)
+    return data
+
+def _get_page(
+    url: str,
+    limit: int,
+    after: Optional[str],
+    filters: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of a paginated list endpoint.
+
+    Only first pages are cached for conditional requests. Later pages are
+    fetched once while scrolling, and caching them would keep every page
+    in memory that the table models evict.
+    """
+    params: Dict[str, Any] = {**(filters or {}), 'limit': limit}
+    if after:
+        params['after'] = after
+
+    try:
+        page = _get_json(url, params, conditional=not after)
+        if page is not None:
+            return page
+        return {"items": [], "next_cursor": None}
+    except Exception as e:
+        return {"items": [], "next_cursor": None, "message": str(e)}
+
+def _iter_pages(
+    get_page: Callable[[int, Optional[str]], Dict[str, Any]],
+    limit: int
+) -> Iterator[Dict[str, Any]]:
+    """Yield the items of all pages, requesting the next page on demand."""
+    after = None
+    while True:
+        page = get_page(limit, after)
+        yield from page['items']
+
+        after = page['next_cursor']
+        if not after:
+            return
+
+def _bulk(
+    url: str,
+    create: Optional[List[Dict[str, Any]]],
+    update: Optional[List[Dict[str, Any]]],
+    delete: Optional[List[int]]
+) -> Dict[str, Any]:
+    """Send a batch to a bulk endpoint."""
+    try:
+        response = client.post(url, json={
+            'create': create or [],
+            'update': update or [],
+            'delete': delete or []
+        })
+        return response.json() if response.status_code in (200, 400) else {}
+    except Exception as e:
+        return { "message": str(e) }
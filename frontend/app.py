@@ -1,14 +1,22 @@
-import sys
+import time
 
-from api import get_orders, get_products
-from PyQt6.QtWidgets import QApplication, QMainWindow, QTabWidget
-from ui.tabs import OrdersTab, ProductsTab
+# Taken before the Qt imports, which are part of the startup time.
+STARTED = time.perf_counter()
+
+import sys  # noqa: E402
+from typing import List, Optional  # noqa: E402
+
+from PyQt6.QtWidgets import QApplication, QMainWindow, QTabWidget  # noqa: E402
+from ui.events import ChangeListener  # noqa: E402
+from ui.startup import StartupProbe  # noqa: E402
+from ui.tabs import OrdersTab, ProductsTab  # noqa: E402
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, probe: Optional[StartupProbe] = None):
         """Main window."""
         super().__init__()
+        self.probe = probe
 
         self.setWindowTitle("Order Manager")
         self.resize(800, 600)
@@ -19,17 +27,40 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        products = get_products()
-        orders = get_orders()
-
-        self.products_tab = ProductsTab(products)
-        self.orders_tab = OrdersTab(orders)
+        # Each tab loads on first show, only the current one at startup.
+        self.products_tab = ProductsTab()
+        self.orders_tab = OrdersTab()
 
         self.tabs.addTab(self.products_tab, "Products")
         self.tabs.addTab(self.orders_tab, "Orders")
 
+        if self.probe:
+            self.probe.watch(self)
+            for tab in (self.products_tab, self.orders_tab):
+                tab.data_loaded.connect(lambda: self.probe.mark('data'))
+
+        # Server pushed change events replace refreshing by hand. The tabs
+        # load in the background, so listen from the current revision on.
+        self.listener = ChangeListener()
+        self.listener.changed.connect(self.apply_changes)
+        self.listener.start()
+
+    def apply_changes(self, tables: List[str]):
+        """Sync the tabs showing the changed tables."""
+        if 'products' in tables:
+            self.products_tab.refresh_products()
+        # Orders embed their product, so product changes affect them too.
+        self.orders_tab.refresh_orders()
+
+    def closeEvent(self, event):
+        """Stop listening for changes when the window is closed."""
+        self.listener.stop()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    window = MainWindow()
+    # --startup-probe prints the startup timings and quits once loaded.
+    probe = StartupProbe(STARTED, exit_when_done='--startup-probe' in sys.argv)
+    window = MainWindow(probe)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,91 @@
+"""
+Round-trip latency of a burst of API calls against a running backend.
+
+Compares a new connection per call (module-level ``requests.get``) against
+the pooled keep-alive session of ApiClient, for sequential calls and for
+calls from a pool of worker threads like the GUI uses.
+
+On loopback the saving per call is small, it grows with the network
+latency and with TLS. The development server closes every connection, so
+start the backend with gunicorn, whose gthread workers keep connections
+alive, then:
+    python benchmarks/bench_client.py [--url http://localhost:5000/api]
+        [--calls 1000] [--threads 8]
+"""
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import requests
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from api import API_URL, ApiClient
+
+Get = Callable[[str], requests.Response]
+
+
+def timed_call(get: Get, url: str) -> float:
+    """Send one GET request and return its round-trip time in seconds."""
+    start = time.perf_counter()
+    response = get(url)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return elapsed
+
+def measure(get: Get, url: str, calls: int, threads: int) -> Dict[str, float]:
+    """Send a burst of calls and return the total and per-call times."""
+    start = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(threads) as executor:
+            latencies: List[float] = list(
+                executor.map(lambda _: timed_call(get, url), range(calls))
+            )
+    else:
+        latencies = [timed_call(get, url) for _ in range(calls)]
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'total': total,
+        'mean': statistics.mean(latencies),
+        'p95': latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default=API_URL)
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    # A small response, so the connection setup dominates.
+    url = f'{args.url}/products?limit=1'
+    client = ApiClient(pool_size=args.threads)
+    clients: Dict[str, Get] = {
+        'new connection': lambda url: requests.get(url, timeout=30),
+        'pooled session': client.get,
+    }
+
+    print(f"{args.calls} GET {url}")
+    print(f"{'client':<16}{'threads':>8}{'total s':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for threads in sorted({1, args.threads}):
+        for name, get in clients.items():
+            # Warm up, so the pooled session starts with open connections.
+            measure(get, url, threads, threads)
+            result = measure(get, url, args.calls, threads)
+            print(f"{name:<16}{threads:>8}{result['total']:>10.2f}"
+                  f"{result['mean'] * 1000:>10.2f}{result['p95'] * 1000:>10.2f}")
+
+    pools = client.session.get_adapter(url).poolmanager.pools
+    opened = sum(pools[key].num_connections for key in pools.keys())
+    print(f"pooled session opened {opened} connections")
+
+    client.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Paint cost of scrolling through a 100k-row products table.
+
+Scrolls an offscreen QTableView page by page from the top to the bottom
+and repaints every page, once with ActionButtonDelegate and once with a
+delegate that renders its icons on every paint like it used to.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_paint.py [--rows 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Type
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import QApplication, QStyledItemDelegate, QTableView
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from ui.delegates import ICON_SIZE, ActionButtonDelegate, button_rects
+from ui.models import ProductsTableModel
+
+
+class UncachedDelegate(ActionButtonDelegate):
+    """Renders the icons on every paint, for comparison."""
+    def paint(self, painter, option, index):
+        QStyledItemDelegate.paint(self, painter, option, index)
+        size = QSize(ICON_SIZE, ICON_SIZE)
+        edit_rect, delete_rect = button_rects(option.rect)
+        for rect, name in ((edit_rect, "document-edit"), (delete_rect, "edit-delete")):
+            painter.drawPixmap(
+                rect.x(), rect.y(), ICON_SIZE, ICON_SIZE,
+                QIcon.fromTheme(name).pixmap(size)
+            )
+
+def create_view(rows: int, delegate: Type[ActionButtonDelegate]) -> QTableView:
+    """Create a table view of generated products."""
+    view = QTableView()
+    view.resize(1000, 800)
+    view.setModel(ProductsTableModel([
+        {'id': i, 'name': f'Product {i}', 'brand': 'Bench',
+         'price': i * 0.25, 'stock': i % 50}
+        for i in range(1, rows + 1)
+    ]))
+    view.setItemDelegateForColumn(5, delegate(view, type="product"))
+    view.show()
+    QApplication.processEvents()
+    return view
+
+def scroll(view: QTableView) -> Dict[str, float]:
+    """Repaint every page from top to bottom, return the frame times."""
+    scrollbar = view.verticalScrollBar()
+    frames = 0
+    start = time.perf_counter()
+    value = scrollbar.minimum()
+    while True:
+        scrollbar.setValue(value)
+        view.viewport().repaint()
+        frames += 1
+        if value >= scrollbar.maximum():
+            break
+        value += scrollbar.pageStep()
+    total = time.perf_counter() - start
+    return {'frames': frames, 'total': total, 'frame': total / frames}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    print(f"{'delegate':<12}{'frames':>8}{'total s':>10}{'frame ms':>10}")
+    for name, delegate in (('uncached', UncachedDelegate),
+                           ('cached', ActionButtonDelegate)):
+        view = create_view(args.rows, delegate)
+        result = scroll(view)
+        print(f"{name:<12}{result['frames']:>8}{result['total']:>10.2f}"
+              f"{result['frame'] * 1000:>10.2f}")
+        view.close()
+    app.quit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QCoreApplication
+from ui.models import OrdersTableModel
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def make_order(order_id):
+    """Build an order as the API returns it."""
+    return {
+        'id': order_id,
+        'product': {
+            'id': 1, 'name': 'Test Product', 'brand': 'Test Brand',
+            'price': 9.99, 'stock': 10
+        },
+        'quantity': 1,
+        'customer': 'Test Customer',
+        'order_date': '2023-09-20',
+        'status': 'open'
+    }
+
+def get_page(limit, after, filters):
+    """Serve pages of 100 orders, the cursor being the last ID."""
+    start = int(after or 0)
+    ids = range(start + 1, min(start + limit, 100) + 1)
+    return {
+        'items': [make_order(order_id) for order_id in ids],
+        'next_cursor': str(ids[-1]) if ids and ids[-1] < 100 else None
+    }
+
+def wait_for(condition, timeout=5):
+    """Process events until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+class TestOrdersTableModel(unittest.TestCase):
+    def test_evict_keeps_max_pages(self):
+        """Test scrolling past the limit keeps at most max_pages in memory."""
+        model = OrdersTableModel(get_page, page_size=10, max_pages=5)
+        model.reload()
+
+        while True:
+            wait_for(lambda: not model._fetching)
+            resident = [page for page in model.pages if page.rows is not None]
+            self.assertLessEqual(len(resident), 5)
+            if model.next_cursor is None:
+                break
+            model.fetchMore()
+
+        self.assertEqual(model.rowCount(), 100)
+        self.assertIsNotNone(model.pages[-1].rows)
+
+if __name__ == '__main__':
+    unittest.main()
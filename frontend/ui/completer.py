@@ -0,0 +1,188 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from api import SEARCH_LIMIT, search_products
+from PyQt6.QtCore import QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
+from PyQt6.QtWidgets import QCompleter, QLineEdit
+
+from .workers import run_request
+
+# Milliseconds without typing before the products are searched.
+SEARCH_DELAY = 200
+# Searches kept by SearchCache, and seconds until they are sent again.
+CACHE_SIZE = 64
+CACHE_TTL = 60
+
+
+def product_label(product: Dict[str, Any]) -> str:
+    """Get the text a product is shown as in the product picker."""
+    return f"{product['name']} ({product['brand']})"
+
+def matches_prefix(product: Dict[str, Any], prefix: str) -> bool:
+    """Whether the name or brand of a product starts with a casefolded prefix."""
+    return (
+        product['name'].casefold().startswith(prefix)
+        or product['brand'].casefold().startswith(prefix)
+    )
+
+class SearchCache:
+    """
+    Small LRU cache of product searches by prefix.
+
+    A search that returned fewer than SEARCH_LIMIT products returned every
+    match, so longer prefixes are answered from it without a request.
+    Results expire after CACHE_TTL seconds to pick up new products.
+    """
+    def __init__(self, size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            size (int): Searches kept at most.
+            ttl (float): Seconds a search is kept.
+        """
+        self.size = size
+        self.ttl = ttl
+        # Products by casefolded prefix, with the time they were stored.
+        self._results: OrderedDict[str, Tuple[float, List[Dict[str, Any]]]] = (
+            OrderedDict()
+        )
+
+    def get(self, prefix: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the products starting with a prefix, if they are known.
+
+        Returns:
+            list: The products, None if the prefix has to be searched.
+        """
+        key = prefix.casefold()
+        now = time.monotonic()
+        for length in range(len(key), 0, -1):
+            entry = self._results.get(key[:length])
+            if entry is None:
+                continue
+
+            stored, products = entry
+            if now - stored > self.ttl:
+                del self._results[key[:length]]
+                continue
+
+            if length == len(key):
+                self._results.move_to_end(key)
+                return products
+
+            if len(products) < SEARCH_LIMIT:
+                return [
+                    product for product in products
+                    if matches_prefix(product, key)
+                ]
+
+            # Shorter prefixes match even more products, so they were cut
+            # off at SEARCH_LIMIT as well.
+            break
+
+        return None
+
+    def set(self, prefix: str, products: List[Dict[str, Any]]):
+        """Store the products found for a prefix."""
+        key = prefix.casefold()
+        self._results[key] = (time.monotonic(), products)
+        self._results.move_to_end(key)
+        while len(self._results) > self.size:
+            self._results.popitem(last=False)
+
+# Shared by all product pickers, so a new dialog starts with the searches
+# of the previous ones.
+search_cache = SearchCache()
+
+
+class ProductCompleter(QCompleter):
+    """
+    Type-ahead product picker for a line edit.
+
+    Products are searched on the server by the start of their name or brand
+    (``api.search_products``) once the user pauses typing for SEARCH_DELAY
+    milliseconds, and shown in the completer popup. Searches are answered
+    from a SearchCache where possible. ``product_selected`` is emitted with
+    the product picked from the popup.
+    """
+    product_selected = pyqtSignal(dict)
+
+    def __init__(self, line_edit: QLineEdit, cache: SearchCache = search_cache):
+        """
+        Initialize the completer.
+
+        Args:
+            line_edit (QLineEdit): Line edit the product name is typed in.
+            cache (SearchCache): Cache of the searches.
+        """
+        super().__init__(line_edit)
+        self.cache = cache
+        self.results = QStandardItemModel(self)
+        self.setModel(self.results)
+        # The server filters, by name or brand, which the label does not
+        # start with in the latter case.
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setWidget(line_edit)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SEARCH_DELAY)
+        self._timer.timeout.connect(self.search)
+
+        line_edit.textEdited.connect(lambda: self._timer.start())
+        self.activated[QModelIndex].connect(self._select)
+
+    def search(self):
+        """Search the products starting with the text of the line edit."""
+        prefix = self._prefix()
+        if not prefix:
+            self.show_products([])
+            return
+
+        products = self.cache.get(prefix)
+        if products is not None:
+            self.show_products(products)
+            return
+
+        run_request(
+            search_products, prefix,
+            on_result=lambda products: self._on_result(prefix, products)
+        )
+
+    def show_products(self, products: List[Dict[str, Any]]):
+        """Show products in the popup, hiding it if there are none."""
+        self.results.clear()
+        for product in products:
+            item = QStandardItem(product_label(product))
+            item.setData(product, Qt.ItemDataRole.UserRole)
+            self.results.appendRow(item)
+
+        popup = self.popup()
+        if products and self.widget().hasFocus():
+            self.complete()
+        elif popup:
+            popup.hide()
+
+    def _on_result(self, prefix: str, products: List[Dict[str, Any]]):
+        """Cache a search, and show it unless the text changed meanwhile."""
+        if products and 'message' in products[0]:
+            # Nothing to suggest, the order can still be saved once the
+            # server is reachable again.
+            return
+
+        self.cache.set(prefix, products)
+        if prefix == self._prefix():
+            self.show_products(products)
+
+    def _prefix(self) -> str:
+        """Get the search prefix typed into the line edit."""
+        return self.widget().text().strip()
+
+    def _select(self, index: QModelIndex):
+        """Emit ``product_selected`` for a product picked from the popup."""
+        product = index.data(Qt.ItemDataRole.UserRole)
+        if product is not None:
+            self.product_selected.emit(product)
@@ -1,22 +1,34 @@
+from typing import Tuple
 
-from PyQt6.QtCore import QEvent, QRect, QSize
+from PyQt6.QtCore import QEvent, QRect, QSize, Qt
 from PyQt6.QtCore import pyqtSignal as Signal
 from PyQt6.QtGui import QIcon, QMouseEvent
 from PyQt6.QtWidgets import (
     QStyledItemDelegate,
 )
 
+BUTTON_WIDTH = 40
+BUTTON_PADDING = 4
+ICON_SIZE = 16
+
 
 class ActionButtonDelegate(QStyledItemDelegate):
-    """Delegate for action buttons in table."""
+    """
+    Delegate for action buttons in table.
+
+    The icons are rendered once per delegate, and the button geometry is
+    derived from the cell rect both when painting and on clicks, so no
+    state is kept per row.
+    """
     edit_clicked = Signal(int)
     delete_clicked = Signal(int)
 
     def __init__(self, parent=None, type="product"):
         super().__init__(parent)
         self.type = type
-        self.edit_btn_rects = {}
-        self.delete_btn_rects = {}
+        size = QSize(ICON_SIZE, ICON_SIZE)
+        self.edit_pixmap = QIcon.fromTheme("document-edit").pixmap(size)
+        self.delete_pixmap = QIcon.fromTheme("edit-delete").pixmap(size)
 
     def paint(
         self,
@@ -30,42 +42,17 @@ class ActionButtonDelegate(QStyledItemDelegate):
 
         super().paint(painter, option, index)
 
-        rect = option.rect
-        btn_width = 40
-        padding = 4
-        icon_size = 16
-
-        edit_rect = QRect(
-            rect.x() + padding,
-            rect.y() + padding,
-            btn_width,
-            rect.height() - 2 * padding
-        )
-
-        delete_rect = QRect(
-            edit_rect.right() + padding,
-            rect.y() + padding,
-            btn_width,
-            rect.height() - 2 * padding
-        )
-
-        row = index.row()
-        self.edit_btn_rects[row] = edit_rect
-        self.delete_btn_rects[row] = delete_rect
-
-        edit_icon_x = edit_rect.x() + (btn_width - icon_size) // 2
-        edit_icon_y = edit_rect.y() + (edit_rect.height() - icon_size) // 2
-        delete_icon_x = delete_rect.x() + (btn_width - icon_size) // 2
-        delete_icon_y = delete_rect.y() + (delete_rect.height() - icon_size) // 2
-
-        painter.drawPixmap(
-            edit_icon_x, edit_icon_y, icon_size, icon_size,
-            QIcon.fromTheme("document-edit").pixmap(QSize(icon_size, icon_size))
-        )
-        painter.drawPixmap(
-            delete_icon_x, delete_icon_y, icon_size, icon_size,
-            QIcon.fromTheme("edit-delete").pixmap(QSize(icon_size, icon_size))
-        )
+        edit_rect, delete_rect = button_rects(option.rect)
+        for rect, pixmap in (
+            (edit_rect, self.edit_pixmap),
+            (delete_rect, self.delete_pixmap)
+        ):
+            painter.drawPixmap(
+                rect.x() + (rect.width() - ICON_SIZE) // 2,
+                rect.y() + (rect.height() - ICON_SIZE) // 2,
+                ICON_SIZE, ICON_SIZE,
+                pixmap
+            )
 
     def editorEvent(self, event, model, option, index):
         """Handle editor events."""
@@ -75,28 +62,49 @@ class ActionButtonDelegate(QStyledItemDelegate):
         if (isinstance(event, QMouseEvent) and
             event.type() == QEvent.Type.MouseButtonRelease
         ):
-            row = index.row()
+            item_id = self._get_item_id(index)
+            # Rows that are still loading have no ID yet.
+            if item_id is None:
+                return False
+
             pos = event.position().toPoint()
+            edit_rect, delete_rect = button_rects(option.rect)
 
-            if (row in self.edit_btn_rects and
-                self.edit_btn_rects[row].contains(pos)
-            ):
-                item_id = self._get_item_id(index)
+            if edit_rect.contains(pos):
                 self.edit_clicked.emit(item_id)
                 return True
 
-            if (row in self.delete_btn_rects and
-                self.delete_btn_rects[row].contains(pos)
-            ):
-                item_id = self._get_item_id(index)
+            if delete_rect.contains(pos):
                 self.delete_clicked.emit(item_id)
                 return True
 
         return False
 
     def _get_item_id(self, index):
-        """Get the item ID."""
-        if self.type == "product":
-            return index.model().products[index.row()]["id"]
-        elif self.type == "order":
-            return index.model().orders[index.row()]["id"]
+        """Get the item ID, which models provide under the UserRole."""
+        return index.data(Qt.ItemDataRole.UserRole)
+
+def button_rects(rect: QRect) -> Tuple[QRect, QRect]:
+    """
+    Get the rects of the edit and delete buttons in a cell.
+
+    Args:
+        rect (QRect): Rect of the cell.
+
+    Returns:
+        tuple: The edit and the delete button rect.
+    """
+    height = rect.height() - 2 * BUTTON_PADDING
+    edit_rect = QRect(
+        rect.x() + BUTTON_PADDING,
+        rect.y() + BUTTON_PADDING,
+        BUTTON_WIDTH,
+        height
+    )
+    delete_rect = QRect(
+        edit_rect.right() + BUTTON_PADDING,
+        rect.y() + BUTTON_PADDING,
+        BUTTON_WIDTH,
+        height
+    )
+    return edit_rect, delete_rect
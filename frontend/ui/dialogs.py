@@ -1,8 +1,7 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from PyQt6.QtWidgets import (
-    QComboBox,
     QDialog,
     QFormLayout,
     QHBoxLayout,
@@ -10,6 +9,8 @@ from PyQt6.QtWidgets import (
     QPushButton,
 )
 
+from .completer import ProductCompleter, product_label
+
 
 class AddProductDialog(QDialog):
     """Dialog for adding a new product."""
@@ -62,30 +63,41 @@ class AddProductDialog(QDialog):
 
 
 class AddOrderDialog(QDialog):
-    """Dialog for adding a new order."""
-    def __init__(self, products: List[Dict[str, Any]], parent=None):
+    """
+    Dialog for adding a new order.
+
+    The product is picked by typing the start of its name or brand, see
+    ProductCompleter, so no product list is loaded up front.
+    """
+    def __init__(self, parent=None, order: Optional[Dict[str, Any]] = None):
         super().__init__(parent)
-        self.products = products
-        self.setWindowTitle("Add Order")
+        # Product picked for the order, None until one is picked.
+        self.product: Optional[Dict[str, Any]] = None
+        self.setWindowTitle("Edit Order" if order else "Add Order")
         self.setup_ui()
 
+        if order:
+            self.set_product(order['product'])
+            self.quantity_input.setText(str(order['quantity']))
+            self.customer_input.setText(order['customer'])
+            self.date_input.setText(order['order_date'])
+
     def setup_ui(self):
         """Setup the dialog UI."""
         layout = QFormLayout()
 
-        self.product_combo = QComboBox()
-        for product in self.products:
-            self.product_combo.addItem(
-                f"{product['name']} ({product['brand']})",
-                product['id']
-            )
+        self.product_input = QLineEdit()
+        self.product_input.setPlaceholderText("Type a product name or brand")
+        self.product_input.textEdited.connect(self._clear_product)
+        self.product_completer = ProductCompleter(self.product_input)
+        self.product_completer.product_selected.connect(self.set_product)
 
         self.quantity_input = QLineEdit()
         self.customer_input = QLineEdit()
         self.date_input = QLineEdit()
         self.date_input.setText(datetime.now().strftime("%Y-%m-%d"))
 
-        layout.addRow("Product:", self.product_combo)
+        layout.addRow("Product:", self.product_input)
         layout.addRow("Quantity:", self.quantity_input)
         layout.addRow("Customer:", self.customer_input)
         layout.addRow("Date:", self.date_input)
@@ -103,10 +115,27 @@ class AddOrderDialog(QDialog):
 
         self.setLayout(layout)
 
+    def set_product(self, product: Dict[str, Any]):
+        """Pick the product of the order."""
+        self.product = product
+        self.product_input.setText(product_label(product))
+
+    def _clear_product(self):
+        """Drop the picked product once its name is edited."""
+        self.product = None
+
     def get_data(self) -> Dict[str, Any]:
-        """Get the dialog data."""
+        """
+        Get the dialog data.
+
+        Raises:
+            ValueError: If no product was picked.
+        """
+        if self.product is None:
+            raise ValueError("Pick a product from the suggestions")
+
         return {
-            "product_id": self.product_combo.currentData(),
+            "product_id": self.product['id'],
             "quantity": int(self.quantity_input.text()),
             "customer": self.customer_input.text(),
             "order_date": self.date_input.text()
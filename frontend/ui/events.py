@@ -0,0 +1,59 @@
+import threading
+from typing import Optional
+
+from api import iter_events
+from PyQt6.QtCore import QThread, pyqtSignal
+
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 30
+# Milliseconds stop() waits for the thread. The stream notices the stop
+# with the next keep-alive, which the server sends every few seconds.
+STOP_TIMEOUT = 5000
+
+
+class ChangeListener(QThread):
+    """
+    Background subscriber to the change events of the server.
+
+    Emits ``changed`` with the names of the changed tables (``products``,
+    ``orders``) whenever the server announces a write, and reconnects with
+    an increasing delay while the server is unreachable or refuses the
+    stream.
+    """
+    changed = pyqtSignal(list)
+
+    def __init__(self, revision: int = 0, parent=None):
+        """
+        Initialize the listener.
+
+        Args:
+            revision (int): Revision the views are synced to, changes after
+                it are announced. 0 starts at the current revision.
+        """
+        super().__init__(parent)
+        self.last_event_id: Optional[str] = str(revision) if revision else None
+        self._stop = threading.Event()
+
+    def run(self):
+        """Listen for events until stopped."""
+        delay = RECONNECT_DELAY
+        while not self._stop.is_set():
+            try:
+                for event in iter_events(self.last_event_id, self._stop):
+                    delay = RECONNECT_DELAY
+                    self.last_event_id = event.get('id', self.last_event_id)
+                    if event.get('event') == 'change':
+                        self.changed.emit(event['data'].get('tables', []))
+            except Exception:
+                self._stop.wait(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def stop(self) -> bool:
+        """
+        Stop listening and wait up to STOP_TIMEOUT for the thread to finish.
+
+        Returns:
+            bool: Whether the thread finished in time.
+        """
+        self._stop.set()
+        return self.wait(STOP_TIMEOUT)
@@ -1,15 +1,114 @@
-from typing import Any, Dict, List
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from PyQt6.QtCore import QAbstractTableModel, Qt
+from api import PAGE_SIZE
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+from .search import TokenIndex, tokenize
+from .workers import run_request
+
+# Pages of orders kept in memory, see OrdersTableModel.
+MAX_RESIDENT_PAGES = 20
+# Server-side sort keys of the sortable order columns.
+ORDER_SORT_KEYS = {0: 'id', 3: 'customer', 4: 'order_date', 5: 'status'}
+
+
+class Row:
+    """
+    Row of a table model: the item as received and what is derived from it.
+
+    The cell texts, the sort key of every sortable column and the search
+    tokens are computed once when the row is created, which happens only
+    when the item changes, so painting a cell is a tuple lookup and sorting
+    compares plain values.
+    """
+    __slots__ = ('id', 'item', 'cells', 'keys', 'tokens')
+
+    def __init__(
+        self,
+        item: Dict[str, Any],
+        cells: Tuple[str, ...],
+        keys: Tuple[Any, ...],
+        tokens: Tuple[str, ...]
+    ):
+        self.id: int = item['id']
+        self.item = item
+        self.cells = cells
+        self.keys = keys
+        self.tokens = tokens
+
+def product_row(product: Dict[str, Any]) -> Row:
+    """Create the row of a product."""
+    name = product.get("name", "")
+    brand = product.get("brand", "")
+    return Row(
+        product,
+        (
+            str(product.get("id", "")),
+            name,
+            brand,
+            f"${product.get('price', 0):,.2f}",
+            str(product.get("stock", "")),
+            ""
+        ),
+        (
+            product['id'],
+            name.casefold(),
+            brand.casefold(),
+            product.get("price", 0),
+            product.get("stock", 0)
+        ),
+        tuple(set(tokenize(f"{product['id']} {name} {brand}")))
+    )
+
+def order_row(order: Dict[str, Any]) -> Row:
+    """Create the row of an order."""
+    product_name = order.get("product", {}).get("name", "")
+    customer = order.get("customer", "")
+    return Row(
+        order,
+        (
+            str(order.get("id", "")),
+            product_name,
+            str(order.get("quantity", "")),
+            customer,
+            order.get("order_date", ""),
+            order.get("status", ""),
+            ""
+        ),
+        (
+            order['id'],
+            product_name.casefold(),
+            order.get("quantity", 0),
+            customer.casefold(),
+            order.get("order_date", ""),
+            order.get("status", "")
+        ),
+        # The same fields the server searches, see OrdersTableModel.
+        tuple(set(tokenize(f"{order['id']} {customer} {product_name}")))
+    )
 
 
 class ProductsTableModel(QAbstractTableModel):
-    """Model for products table."""
+    """
+    Model for products table.
+
+    All products are in memory, so they are searched and sorted locally:
+    ``tokens`` indexes the words of every row for SearchProxyModel, and
+    :meth:`sort` orders the rows by their precomputed keys.
+    """
     def __init__(self, products: List[Dict[str, Any]]):
         """Initialize the products model."""
         super().__init__()
-        self.products = products
+        self.rows = [product_row(product) for product in products]
         self.headers = ["ID","Name", "Brand", "Price", "Stock", "Actions"]
+        self.tokens = TokenIndex()
+        # Column and order of the last sort, kept when rows change.
+        self._sort: Optional[Tuple[int, Qt.SortOrder]] = None
+        self._by_id: Dict[int, Row] = {}
+        self._reindex()
+        for row in self.rows:
+            self.tokens.add(row.id, row.tokens)
 
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         """Get data for table."""
@@ -17,31 +116,101 @@ class ProductsTableModel(QAbstractTableModel):
             return None
 
         if role == Qt.ItemDataRole.DisplayRole:
-            product = self.products[index.row()]
-            return self._get_display_value(index.column(), product)
+            return self.rows[index.row()].cells[index.column()]
+
+        if role == Qt.ItemDataRole.UserRole:
+            return self.rows[index.row()].id
 
         return None
 
-    def _get_display_value(
+    def apply_changes(
         self,
-        column: int,
-        product: Dict[str, Any]
-    ) -> str:
-        """Get display value for column"""
-        mapping = {
-            0: lambda p: str(p.get("id", "")),
-            1: lambda p: p.get("name", ""),
-            2: lambda p: p.get("brand", ""),
-            3: lambda p: f"${p.get('price', 0):,.2f}",
-            4: lambda p: str(p.get("stock", "")),
-            5: lambda p: ""
-        }
-
-        return mapping.get(column, lambda p: "")(product)
+        products: List[Dict[str, Any]],
+        deleted_ids: List[int]
+    ):
+        """Patch the table with changed and deleted products from a sync."""
+        self._update_rows([product_row(p) for p in products], deleted_ids)
+
+    def set_products(self, products: List[Dict[str, Any]]):
+        """
+        Replace the products, touching only the rows that differ.
+
+        Unlike a model reset, this keeps the scroll position and selection
+        of the view.
+        """
+        current = self._by_id
+        new_ids = {product['id'] for product in products}
+        self._update_rows(
+            [
+                product_row(p) for p in products
+                if p['id'] not in current or current[p['id']].item != p
+            ],
+            [product_id for product_id in current if product_id not in new_ids]
+        )
+
+    def product(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """Get a product of the table by its ID."""
+        row = self._by_id.get(product_id)
+        return row.item if row is not None else None
+
+    def row_matches(self, row: int) -> bool:
+        """Whether a row matches the search of ``tokens``."""
+        matches = self.tokens.matches
+        return matches is None or self.rows[row].id in matches
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """
+        Sort the rows by a column.
+
+        Rows are compared by the keys computed when they were created, and
+        stay sorted as they change. The action column is not sortable.
+        """
+        self._sort = (column, order)
+        self._sort_rows()
+
+    def _update_rows(self, changed: List[Row], deleted_ids: List[int]):
+        """Patch the rows and the indexes, then sort them again."""
+        # The search index is updated first, so the proxy filters the
+        # patched rows with their new tokens.
+        for row_id in deleted_ids:
+            self.tokens.remove(row_id)
+        for row in changed:
+            self.tokens.add(row.id, row.tokens)
+
+        _apply_changes(self, self.rows, changed, deleted_ids)
+        self._reindex()
+        if changed:
+            self._sort_rows()
+
+    def _sort_rows(self):
+        """Order the rows by the last sort, keeping persistent indexes."""
+        if self._sort is None:
+            return
+        column, order = self._sort
+        if column >= len(self.rows[0].keys if self.rows else ()):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_rows = [self.rows[index.row()] for index in persistent]
+        self.rows.sort(
+            key=lambda row: row.keys[column],
+            reverse=order == Qt.SortOrder.DescendingOrder
+        )
+        positions = {row.id: position for position, row in enumerate(self.rows)}
+        self.changePersistentIndexList(persistent, [
+            self.index(positions[row.id], index.column())
+            for row, index in zip(persistent_rows, persistent, strict=True)
+        ])
+        self.layoutChanged.emit()
+
+    def _reindex(self):
+        """Rebuild the index of the rows by ID."""
+        self._by_id = {row.id: row for row in self.rows}
 
     def rowCount(self, parent=None) -> int:
         """Get row count."""
-        return len(self.products)
+        return len(self.rows)
 
     def columnCount(self, parent=None) -> int:
         """Get column count."""
@@ -63,50 +232,268 @@ class ProductsTableModel(QAbstractTableModel):
         """Get flags for cell."""
         if index.column() == 5:
             return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
-        return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+class _Page:
+    """
+    Page of orders as fetched from the server.
+
+    ``rows`` is None while the page is evicted; ``after`` and ``size`` are
+    kept so it can be fetched again when it is scrolled back into view.
+    """
+    __slots__ = ('after', 'size', 'last_id', 'rows', 'loading')
+
+    def __init__(self, after: Optional[str], rows: List[Row]):
+        self.after = after
+        self.size = len(rows)
+        self.last_id = rows[-1].id if rows else None
+        self.rows: Optional[List[Row]] = rows
+        self.loading = False
 
 class OrdersTableModel(QAbstractTableModel):
-    """Model for orders table."""
-    def __init__(self, orders: List[Dict[str, Any]]):
-        """Initialize the orders model."""
+    """
+    Model for orders table, fetched page by page.
+
+    Nothing is fetched before :meth:`reload`. Pages are then fetched in the
+    background as the view scrolls down (see :meth:`canFetchMore`), and
+    only the MAX_RESIDENT_PAGES pages nearest to the rows last shown are
+    kept. Evicted pages are fetched again from their cursor when they come
+    back into view, with empty cells until then, so memory stays bounded
+    however many orders are browsed.
+
+    The resident rows are indexed in ``tokens`` for SearchProxyModel, which
+    can search them locally while :meth:`is_complete`. Otherwise searching
+    and sorting are left to the server through ``filters``, see
+    :meth:`set_search` and :meth:`sort`.
+    """
+    error = pyqtSignal(str)
+    # Emitted after a page was fetched from the end of the list.
+    fetched = pyqtSignal()
+
+    def __init__(
+        self,
+        get_page: Callable[
+            [int, Optional[str], Optional[Dict[str, Any]]], Dict[str, Any]
+        ],
+        page_size: int = PAGE_SIZE,
+        max_pages: int = MAX_RESIDENT_PAGES
+    ):
+        """
+        Initialize the orders model.
+
+        Args:
+            get_page (callable): Function fetching a page of orders with a
+                page size, the cursor to start after and the filters, like
+                ``api.get_orders_page``. It is called in the background.
+            page_size (int): Orders per page.
+            max_pages (int): Pages kept in memory at most.
+        """
         super().__init__()
-        self.orders = orders
+        self.get_page = get_page
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages: List[_Page] = []
         self.headers = [
             'ID', 'Product', 'Quantity', 'Customer', 'Date', 'Status', 'Actions'
         ]
+        # Server-side filters and sort key of the pages.
+        self.filters: Dict[str, Any] = {}
+        self.tokens = TokenIndex()
+        # Resident rows by order ID, with the page holding them.
+        self._by_id: Dict[int, Tuple[_Page, Row]] = {}
+        # Cursor of the next page, '' before the first and None after the
+        # last one.
+        self.next_cursor: Optional[str] = None
+        self._fetching = False
+        # Bumped by reload(), so pages requested before are dropped.
+        self._generation = 0
+        # First row of every page, to find the page of a row.
+        self._starts: List[int] = []
+        self._row_count = 0
+        self._max_id = 0
+        self._current_page = 0
 
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         """Get data for table."""
         if not index.isValid():
             return None
 
-        if role == Qt.ItemDataRole.DisplayRole:
-            order = self.orders[index.row()]
-            return self._get_display_value(index.column(), order)
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole):
+            row = self._row_at(index.row())
+            if row is None:
+                return None
+            if role == Qt.ItemDataRole.UserRole:
+                return row.id
+            return row.cells[index.column()]
 
         return None
 
-    def _get_display_value(
+    def _row_at(self, row: int) -> Optional[Row]:
+        """
+        Get the row record of a row.
+
+        Returns None while the page of the row is not in memory, and starts
+        fetching it.
+        """
+        number = bisect_right(self._starts, row) - 1
+        page = self.pages[number]
+        self._current_page = number
+        if page.rows is None:
+            self._load_page(number)
+            return None
+        return page.rows[row - self._starts[number]]
+
+    def row_matches(self, row: int) -> bool:
+        """
+        Whether a row matches the search of ``tokens``.
+
+        Rows that are not in memory never match, and are not fetched.
+        """
+        matches = self.tokens.matches
+        if matches is None:
+            return True
+
+        number = bisect_right(self._starts, row) - 1
+        rows = self.pages[number].rows
+        return rows is not None and rows[row - self._starts[number]].id in matches
+
+    def is_complete(self) -> bool:
+        """Whether all orders are in memory, so they can be searched locally."""
+        return (
+            self.next_cursor is None
+            and 'search' not in self.filters
+            and all(page.rows is not None for page in self.pages)
+        )
+
+    def set_search(self, text: str):
+        """Reload the orders matching a search on the server."""
+        text = text.strip()
+        if text == self.filters.get('search', ''):
+            return
+
+        if text:
+            self.filters['search'] = text
+        else:
+            self.filters.pop('search', None)
+        self.reload()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """
+        Reload the orders sorted by a column on the server.
+
+        Only the columns in ORDER_SORT_KEYS are sortable, as the pages
+        come from the server in the order of their cursors.
+        """
+        key = ORDER_SORT_KEYS.get(column)
+        if key is None:
+            return
+        if order == Qt.SortOrder.DescendingOrder:
+            key = f'-{key}'
+        if key == self.filters.get('sort', 'id'):
+            return
+
+        if key == 'id':
+            self.filters.pop('sort', None)
+        else:
+            self.filters['sort'] = key
+        self.reload()
+
+    def find(self, order_id: int) -> Optional[Dict[str, Any]]:
+        """Get an order in memory by its ID."""
+        entry = self._by_id.get(order_id)
+        return entry[1].item if entry is not None else None
+
+    def canFetchMore(self, parent=None) -> bool:
+        """Whether there are orders after the last fetched page."""
+        return (
+            not (parent is not None and parent.isValid())
+            and self.next_cursor is not None
+            and not self._fetching
+        )
+
+    def fetchMore(self, parent=None):
+        """Fetch the next page of orders in the background."""
+        if not self.canFetchMore(parent):
+            return
+
+        self._fetching = True
+        after = self.next_cursor or None
+        generation = self._generation
+        run_request(
+            self.get_page, self.page_size, after, dict(self.filters),
+            on_result=lambda page: self._append_page(generation, after, page)
+        )
+
+    def reload(self):
+        """Drop all pages and fetch the orders from the first page again."""
+        self.beginResetModel()
+        self._generation += 1
+        self.pages = []
+        self.tokens.clear()
+        self._by_id.clear()
+        self.next_cursor = ''
+        self._fetching = False
+        self._max_id = 0
+        self._current_page = 0
+        self._update_starts()
+        self.endResetModel()
+        self.fetchMore()
+
+    def apply_changes(
         self,
-        column: int,
-        order: Dict[str, Any]
-    ) -> str:
-        """Get display value for column"""
-        mapping = {
-            0: lambda o: str(o.get("id", "")),
-            1: lambda o: o.get("product", {}).get("name", ""),
-            2: lambda o: str(o.get("quantity", "")),
-            3: lambda o: o.get("customer", ""),
-            4: lambda o: o.get("order_date", ""),
-            5: lambda o: o.get("status", ""),
-            6: lambda o: ""
-        }
-
-        return mapping.get(column, lambda o: "")(order)
+        orders: List[Dict[str, Any]],
+        deleted_ids: List[int],
+        products: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Patch the pages in memory with changed and deleted orders from a sync.
+
+        Changed products replace the products embedded in the orders. New
+        orders are appended once the last page was fetched, and come with
+        their page otherwise. Evicted pages pick up changes when they are
+        fetched again. With filters, new orders may not match or belong
+        elsewhere, so they are left to the next reload.
+        """
+        changed_products = {product['id']: product for product in products or ()}
+        changed_orders = {order['id']: order for order in orders}
+        deleted = set(deleted_ids)
+
+        for number, page in enumerate(self.pages):
+            if page.rows is None:
+                continue
+
+            for offset, current in enumerate(page.rows):
+                changed = changed_orders.pop(current.id, None)
+                product = changed_products.get(current.item['product']['id'])
+                if changed is None and product is not None:
+                    changed = {**current.item, 'product': product}
+                if changed is not None:
+                    page.rows[offset] = order_row(changed)
+                    self._index_rows(page, [page.rows[offset]])
+                    row = self._starts[number] + offset
+                    self.dataChanged.emit(
+                        self.index(row, 0),
+                        self.index(row, self.columnCount() - 1)
+                    )
+
+            # Remove from the bottom up so the offsets of the rest stay valid.
+            for offset in reversed(range(len(page.rows))):
+                if page.rows[offset].id in deleted:
+                    self._remove_rows(number, offset, offset + 1)
+
+        new_orders = [
+            order for order_id, order in changed_orders.items()
+            if order_id > self._max_id
+        ]
+        if new_orders and self.next_cursor is None and not self.filters:
+            self._insert_page(
+                _Page(None, [order_row(order) for order in new_orders]),
+                append=bool(self.pages)
+            )
 
     def rowCount(self, parent=None) -> int:
         """Get row count."""
-        return len(self.orders)
+        return self._row_count
 
     def columnCount(self, parent=None) -> int:
         """Get column count."""
@@ -128,4 +515,195 @@ class OrdersTableModel(QAbstractTableModel):
         """Get flags for cell."""
         if index.column() == 6:
             return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
-        return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def _append_page(
+        self,
+        generation: int,
+        after: Optional[str],
+        result: Dict[str, Any]
+    ):
+        """Add a page fetched from the end of the list."""
+        if generation != self._generation:
+            return
+
+        self._fetching = False
+        if 'message' in result:
+            # Stop fetching until the tab is reloaded instead of retrying
+            # on every scroll.
+            self.next_cursor = None
+            self.error.emit(result['message'])
+            return
+
+        self.next_cursor = result['next_cursor']
+        if result['items']:
+            self._insert_page(
+                _Page(after, [order_row(order) for order in result['items']])
+            )
+            self._evict(len(self.pages) - 1)
+        self.fetched.emit()
+
+    def _insert_page(self, page: _Page, append: bool = False):
+        """
+        Add a page after the last one.
+
+        With ``append`` its rows are added to the last page instead, which
+        then keeps its cursor.
+        """
+        rows = page.rows or []
+        self.beginInsertRows(
+            QModelIndex(), self._row_count, self._row_count + len(rows) - 1
+        )
+        # Rows are indexed before endInsertRows(), where the search proxy
+        # filters them. Rows appended to an evicted page come with it.
+        if append:
+            last = self.pages[-1]
+            if last.rows is not None:
+                last.rows.extend(rows)
+                self._index_rows(last, rows)
+            last.size += len(rows)
+            last.last_id = page.last_id
+        else:
+            self.pages.append(page)
+            self._index_rows(page, rows)
+        self._max_id = max([self._max_id, *(row.id for row in rows)])
+        self._update_starts()
+        self.endInsertRows()
+
+    def _load_page(self, number: int):
+        """Fetch an evicted page again in the background."""
+        page = self.pages[number]
+        if page.loading:
+            return
+
+        page.loading = True
+        run_request(
+            self.get_page, page.size, page.after, dict(self.filters),
+            on_result=lambda result: self._reload_page(page, result)
+        )
+
+    def _reload_page(self, page: _Page, result: Dict[str, Any]):
+        """Put the rows of a fetched evicted page back in place."""
+        page.loading = False
+        if page not in self.pages or page.rows is not None:
+            return
+        if 'message' in result:
+            self.error.emit(result['message'])
+            return
+
+        rows = [order_row(order) for order in result['items'][:page.size]]
+        # Rows deleted meanwhile pull in rows of the next page, cut the page
+        # at its last row again.
+        ids = [row.id for row in rows]
+        if page.last_id in ids:
+            rows = rows[:ids.index(page.last_id) + 1]
+
+        number = self.pages.index(page)
+        page.rows = rows
+        self._index_rows(page, rows)
+        if len(rows) < page.size:
+            self._remove_rows(number, len(rows), page.size)
+
+        if rows:
+            first = self._starts[number]
+            self.dataChanged.emit(
+                self.index(first, 0),
+                self.index(first + len(rows) - 1, self.columnCount() - 1)
+            )
+        self._evict(number)
+
+    def _remove_rows(self, number: int, first: int, last: int):
+        """Remove the rows ``first`` to ``last`` (exclusive) of a page."""
+        page = self.pages[number]
+        start = self._starts[number]
+        self.beginRemoveRows(QModelIndex(), start + first, start + last - 1)
+        if page.rows is not None:
+            self._unindex_rows(page.rows[first:last])
+            del page.rows[first:last]
+            if page.rows:
+                page.last_id = page.rows[-1].id
+        page.size -= last - first
+        self._update_starts()
+        self.endRemoveRows()
+
+    def _update_starts(self):
+        """Recompute the first row of every page."""
+        self._starts = []
+        self._row_count = 0
+        for page in self.pages:
+            self._starts.append(self._row_count)
+            self._row_count += page.size
+
+    def _evict(self, keep: int):
+        """Drop the resident pages farthest from the current page."""
+        resident = [
+            number for number, page in enumerate(self.pages)
+            if page.rows is not None and number != keep
+        ]
+        # The kept page counts against the limit as well.
+        overflow = len(resident) + 1 - self.max_pages
+        if overflow <= 0:
+            return
+
+        around = self._current_page
+        resident.sort(key=lambda number: abs(number - around), reverse=True)
+        for number in resident[:overflow]:
+            self._unindex_rows(self.pages[number].rows or [])
+            self.pages[number].rows = None
+
+    def _index_rows(self, page: _Page, rows: List[Row]):
+        """Index resident rows of a page by ID and search tokens."""
+        for row in rows:
+            self._by_id[row.id] = (page, row)
+            self.tokens.add(row.id, row.tokens)
+
+    def _unindex_rows(self, rows: List[Row]):
+        """Drop rows leaving memory from the indexes."""
+        for row in rows:
+            self._by_id.pop(row.id, None)
+            self.tokens.remove(row.id)
+
+def _apply_changes(
+    model: QAbstractTableModel,
+    rows: List[Row],
+    changed: List[Row],
+    deleted_ids: List[int]
+):
+    """
+    Patch the rows of a model in place.
+
+    Changed rows replace the rows with the same ID, unknown ones are
+    appended, and deleted rows are removed, so only the affected rows are
+    repainted.
+    """
+    positions = {row.id: position for position, row in enumerate(rows)}
+
+    new_rows = []
+    for row in changed:
+        position = positions.get(row.id)
+        if position is None:
+            new_rows.append(row)
+            continue
+
+        rows[position] = row
+        model.dataChanged.emit(
+            model.index(position, 0),
+            model.index(position, model.columnCount() - 1)
+        )
+
+    # Remove from the bottom up so the positions of the rest stay valid.
+    deleted = sorted(
+        (positions[row_id] for row_id in set(deleted_ids) if row_id in positions),
+        reverse=True
+    )
+    for position in deleted:
+        model.beginRemoveRows(QModelIndex(), position, position)
+        del rows[position]
+        model.endRemoveRows()
+
+    if new_rows:
+        model.beginInsertRows(
+            QModelIndex(), len(rows), len(rows) + len(new_rows) - 1
+        )
+        rows.extend(new_rows)
+        model.endInsertRows()
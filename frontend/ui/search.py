@@ -0,0 +1,128 @@
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import QSortFilterProxyModel, Qt
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase words."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+class TokenIndex:
+    """
+    Inverted index of the words of table rows, for prefix search.
+
+    A query matches the rows that have a word starting with each of its
+    terms. The rows matching the current query are kept in ``matches`` and
+    updated as rows are added and removed, so a filter only has to look up
+    row IDs.
+    """
+    def __init__(self):
+        # Row IDs matching the current query, None without a query.
+        self.matches: Optional[Set[int]] = None
+        self._terms: Tuple[str, ...] = ()
+        self._ids: Dict[str, Set[int]] = {}
+        self._tokens: Dict[int, Tuple[str, ...]] = {}
+        # Sorted tokens for prefix lookups, rebuilt when tokens come or go.
+        self._sorted: Optional[List[str]] = None
+
+    def add(self, row_id: int, tokens: Tuple[str, ...]):
+        """Index the tokens of a row, replacing the ones it had."""
+        self.remove(row_id)
+        self._tokens[row_id] = tokens
+        for token in tokens:
+            ids = self._ids.get(token)
+            if ids is None:
+                ids = self._ids[token] = set()
+                self._sorted = None
+            ids.add(row_id)
+
+        if self.matches is not None and all(
+            any(token.startswith(term) for token in tokens)
+            for term in self._terms
+        ):
+            self.matches.add(row_id)
+
+    def remove(self, row_id: int):
+        """Drop a row from the index."""
+        tokens = self._tokens.pop(row_id, None)
+        if tokens is None:
+            return
+
+        for token in tokens:
+            ids = self._ids[token]
+            ids.discard(row_id)
+            if not ids:
+                del self._ids[token]
+                self._sorted = None
+
+        if self.matches is not None:
+            self.matches.discard(row_id)
+
+    def clear(self):
+        """Drop all rows, keeping the query."""
+        self._ids.clear()
+        self._tokens.clear()
+        self._sorted = None
+        if self.matches is not None:
+            self.matches = set()
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        """
+        Set the current query.
+
+        Returns:
+            set: IDs of the matching rows, None for an empty query.
+        """
+        self._terms = tuple(tokenize(query))
+        if not self._terms:
+            self.matches = None
+            return None
+
+        if self._sorted is None:
+            self._sorted = sorted(self._ids)
+
+        matches: Optional[Set[int]] = None
+        for term in self._terms:
+            ids: Set[int] = set()
+            position = bisect_left(self._sorted, term)
+            while (
+                position < len(self._sorted)
+                and self._sorted[position].startswith(term)
+            ):
+                ids |= self._ids[self._sorted[position]]
+                position += 1
+            matches = ids if matches is None else matches & ids
+
+        self.matches = matches
+        return matches
+
+class SearchProxyModel(QSortFilterProxyModel):
+    """
+    Search and sort layer over a table model.
+
+    Filtering asks the source model whether a row matches its current
+    search, see ``row_matches()``, which is backed by a TokenIndex. Sorting
+    is passed on to the source model, which sorts by precomputed keys
+    instead of comparing cells through the proxy.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+
+    def search(self, query: str):
+        """Show only the rows matching a query, all for an empty one."""
+        self.query = query
+        self.sourceModel().tokens.search(query)
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent) -> bool:
+        """Whether a row matches the current search."""
+        return self.sourceModel().row_matches(source_row)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort the source model."""
+        self.sourceModel().sort(column, order)
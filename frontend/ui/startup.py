@@ -0,0 +1,67 @@
+import json
+import sys
+import time
+from typing import Dict, Optional
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication, QWidget
+
+# Seconds the probe waits for data before it reports without it.
+PROBE_TIMEOUT = 60
+
+
+class StartupProbe(QObject):
+    """
+    Measures how long the application takes to start.
+
+    Records the milliseconds from ``started`` to the first paint of the
+    main window (``first_paint``) and to the first rows shown in a tab
+    (``data``). With ``exit_when_done`` the timings are printed as one JSON
+    line once both are known, and the application quits, so startup can be
+    tracked from scripts.
+    """
+    def __init__(self, started: float, exit_when_done: bool = False):
+        """
+        Initialize the probe.
+
+        Args:
+            started (float): ``time.perf_counter()`` at process start.
+            exit_when_done (bool): Print the timings and quit once measured.
+        """
+        super().__init__()
+        self.started = started
+        self.exit_when_done = exit_when_done
+        self.timings: Dict[str, Optional[float]] = {'first_paint': None, 'data': None}
+        self._window: Optional[QWidget] = None
+        self._reported = False
+
+    def watch(self, window: QWidget):
+        """Watch a window for its first paint."""
+        self._window = window
+        window.installEventFilter(self)
+        if self.exit_when_done:
+            QTimer.singleShot(PROBE_TIMEOUT * 1000, self.report)
+
+    def mark(self, name: str):
+        """Record the time of an event, only its first occurrence counts."""
+        if self.timings.get(name) is None:
+            self.timings[name] = round((time.perf_counter() - self.started) * 1000, 1)
+        if self.exit_when_done and None not in self.timings.values():
+            self.report()
+
+    def eventFilter(self, watched, event) -> bool:
+        """Record the first paint of the watched window."""
+        if watched is self._window and event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            # Marked after the paint event was handled.
+            QTimer.singleShot(0, lambda: self.mark('first_paint'))
+        return False
+
+    def report(self):
+        """Print the timings in milliseconds and quit."""
+        if self._reported:
+            return
+        self._reported = True
+        print(json.dumps({f'{name}_ms': ms for name, ms in self.timings.items()}))
+        sys.stdout.flush()
+        QApplication.quit()
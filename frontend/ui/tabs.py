@@ -1,22 +1,29 @@
-from typing import Any, Dict, List
+from abc import ABCMeta, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
 
 from api import (
     create_order,
     create_product,
     delete_order,
     delete_product,
-    get_orders,
-    get_products,
+    get_order,
+    get_orders_page,
+    get_product,
+    get_products_page,
+    get_revision,
+    sync,
     update_order,
     update_product,
 )
-from PyQt6.QtCore import QSize
+from PyQt6.QtCore import QSize, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon
 from PyQt6.QtWidgets import (
     QHBoxLayout,
     QHeaderView,
     QLabel,
+    QLineEdit,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QTableView,
     QVBoxLayout,
@@ -27,15 +34,187 @@ from .delegates import ActionButtonDelegate
 from .dialogs import AddOrderDialog, AddProductDialog
 from .messages import show_confirmation, show_error, show_info
 from .models import OrdersTableModel, ProductsTableModel
+from .search import SearchProxyModel
+from .workers import ApiRequest, run_request
 
+# Milliseconds without typing before a search runs.
+SEARCH_DELAY = 250
 
-class ProductsTab(QWidget):
+
+class _AbstractWidgetMeta(type(QWidget), ABCMeta):
+    """Metaclass of abstract widgets, combining Qt's with ABCMeta."""
+
+class ApiTab(QWidget, metaclass=_AbstractWidgetMeta):
+    """
+    Abstract base of the tabs, running their API calls in the background.
+
+    A tab loads its data when it is shown for the first time, so hidden tabs
+    cost nothing at startup. ``data_loaded`` is emitted once the first rows
+    are shown. Typing in ``search_input`` calls :meth:`search` once the user
+    pauses.
+    """
+    data_loaded = pyqtSignal()
+
+    def __init__(self):
+        """Initialize the tab."""
+        super().__init__()
+        # Revision of the last sync, 0 until the first one.
+        self.revision = 0
+        self.loaded = False
+        self._data_shown = False
+        self._requests: Dict[Optional[str], List[ApiRequest]] = {}
+
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setRange(0, 0)
+        self.loading_bar.setTextVisible(False)
+        self.loading_bar.setMaximumWidth(80)
+        self.loading_bar.setToolTip("Loading...")
+        self.loading_bar.hide()
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setMaximumWidth(250)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY)
+        self._search_timer.timeout.connect(
+            lambda: self.search(self.search_input.text())
+        )
+        self.search_input.textChanged.connect(
+            lambda: self._search_timer.start()
+        )
+
+    def request(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_result: Callable[[Any], None],
+        name: Optional[str] = None
+    ) -> ApiRequest:
+        """
+        Run an API call in the background while the loading bar is shown.
+
+        Starting a request with a name cancels the unfinished requests with
+        the same name, e.g. a refresh still loading when the next one starts.
+        Errors are shown to the user.
+        """
+        if name is not None:
+            for previous in self._requests.get(name, []):
+                previous.cancel()
+
+        request: Optional[ApiRequest] = None
+
+        def finished():
+            self._requests[name].remove(request)
+            self._update_loading_bar()
+
+        request = run_request(
+            fn, *args,
+            on_result=on_result,
+            on_error=lambda message: show_error(self, message),
+            on_finished=finished
+        )
+        self._requests.setdefault(name, []).append(request)
+        self._update_loading_bar()
+        return request
+
+    def showEvent(self, event):
+        """Load the tab when it is shown for the first time."""
+        super().showEvent(event)
+        if not self.loaded:
+            self.loaded = True
+            self.load()
+
+    @abstractmethod
+    def load(self):
+        """Load the data of the tab, called when it is first shown."""
+
+    @abstractmethod
+    def search(self, text: str):
+        """Show only the rows matching a search text, all for an empty one."""
+
+    def setup_table(self, model, proxy: SearchProxyModel):
+        """Show a model in the table through a search proxy, sorted by ID."""
+        proxy.setSourceModel(model)
+        self.table.setModel(proxy)
+        header = self.table.horizontalHeader()
+        if header:
+            header.setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+
+    def load_first_page(
+        self,
+        get_page: Callable[[], Dict[str, Any]],
+        load_rows: Callable[[List[Dict[str, Any]]], None],
+        sync: Callable[[], None]
+    ):
+        """
+        Show the first page of rows, then sync the tab.
+
+        A page comes back faster than a full sync, so the table fills as
+        soon as possible and the sync completes it.
+        """
+        def on_result(page: Dict[str, Any]):
+            if 'message' in page:
+                show_error(self, page['message'])
+            else:
+                load_rows(page['items'])
+                self._show_data()
+            sync()
+
+        self.request(get_page, on_result=on_result, name='sync')
+
+    def sync_changes(
+        self,
+        tables: List[str],
+        apply: Callable[[Dict[str, Any], bool], None],
+        full_tables: Optional[List[str]] = None
+    ):
+        """
+        Sync the tab in the background.
+
+        ``apply`` gets the changes since the last sync and whether they are
+        a full snapshot, which replaces the table instead of patching it.
+        A full snapshot only holds ``full_tables`` (default: ``tables``),
+        and just the revision if that is empty.
+        Tabs that were not shown yet are skipped, they sync on first show.
+        """
+        if not self.loaded:
+            return
+
+        def on_result(changes: Dict[str, Any]):
+            apply(changes, changes.pop('full'))
+            self.revision = changes['revision']
+
+        self.request(
+            _sync_changes, self.revision, tables,
+            tables if full_tables is None else full_tables,
+            on_result=on_result,
+            name='sync'
+        )
+
+    def _show_data(self):
+        """Emit ``data_loaded`` the first time rows are shown."""
+        if not self._data_shown:
+            self._data_shown = True
+            self.data_loaded.emit()
+
+    def _update_loading_bar(self):
+        """Show the loading bar while requests that matter are running."""
+        self.loading_bar.setVisible(any(
+            not request.cancelled
+            for requests in self._requests.values()
+            for request in requests
+        ))
+
+
+class ProductsTab(ApiTab):
     """Tab for managing products."""
-    def __init__(self, products: List[Dict[str, Any]]):
+    def __init__(self):
         """Initialize the products tab."""
         super().__init__()
         self.setup_ui()
-        self.load_products(products)
 
     def setup_ui(self):
         """Setup the tab UI."""
@@ -62,6 +241,8 @@ class ProductsTab(QWidget):
         add_btn.clicked.connect(self.add_product)
         refresh_btn.clicked.connect(self.refresh_products)
 
+        button_layout.addWidget(self.loading_bar)
+        button_layout.addWidget(self.search_input)
         button_layout.addWidget(add_btn)
         button_layout.addWidget(refresh_btn)
 
@@ -72,8 +253,12 @@ class ProductsTab(QWidget):
         layout.addLayout(header_layout)
 
         self.table = QTableView()
+        self.table.setSelectionBehavior(
+            QTableView.SelectionBehavior.SelectRows
+        )
         self.model = ProductsTableModel([])
-        self.table.setModel(self.model)
+        self.proxy = SearchProxyModel(self)
+        self.setup_table(self.model, self.proxy)
 
         self.action_delegate = ActionButtonDelegate(self.table, type="product")
         self.action_delegate.edit_clicked.connect(self.edit_product)
@@ -90,14 +275,8 @@ class ProductsTab(QWidget):
         self.setLayout(layout)
 
     def load_products(self, products: List[Dict[str, Any]]):
-        """Load products into the table."""
-        self.model = ProductsTableModel(products)
-        self.table.setModel(self.model)
-
-        self.action_delegate = ActionButtonDelegate(self.table, type="product")
-        self.action_delegate.edit_clicked.connect(self.edit_product)
-        self.action_delegate.delete_clicked.connect(self.delete_product)
-        self.table.setItemDelegateForColumn(5, self.action_delegate)
+        """Load products into the table, updating only the rows that differ."""
+        self.model.set_products(products)
 
     def add_product(self):
         """Open dialog to add a new product."""
@@ -105,14 +284,10 @@ class ProductsTab(QWidget):
         if dialog.exec() == AddProductDialog.DialogCode.Accepted:
             try:
                 data = dialog.get_data()
-                response = create_product(data)
-                if 'id' in response:
-                    self.refresh_products()
-                else:
-                    show_error(
-                        self,
-                        response.get('message', 'Unknown error')
-                    )
+                self.request(
+                    create_product, data,
+                    on_result=self._on_product_saved
+                )
             except Exception as e:
                 show_error(self, str(e))
 
@@ -122,50 +297,90 @@ class ProductsTab(QWidget):
             self,
             "Are you sure you want to delete this product?"
         ):
-            try:
-                response = delete_product(product_id)
-                if 'message' in response:
-                    show_info(self, "Product deleted successfully")
-                    self.refresh_products()
-                else:
-                    show_error(self, response.get('message', 'Unknown error'))
-            except Exception as e:
-                show_error(self, str(e))
+            self.request(
+                delete_product, product_id,
+                on_result=self._on_product_deleted
+            )
 
     def edit_product(self, product_id: int):
         """Open dialog to edit a product."""
-        products = get_products()
-        product = next((p for p in products if p['id'] == product_id), None)
-        if product:
-            dialog = AddProductDialog(self, product)
-
-            if dialog.exec() == AddProductDialog.DialogCode.Accepted:
-                try:
-                    data = dialog.get_data()
-                    response = update_product(product_id, data)
-                    if 'id' in response:
-                        self.refresh_products()
-                    else:
-                        show_error(
-                            self,
-                            response.get('message', 'Unknown error')
-                        )
-                except Exception as e:
-                    show_error(self, str(e))
+        product = self.model.product(product_id)
+        if product is not None:
+            self._open_edit_dialog(product)
+        else:
+            self.request(
+                get_product, product_id,
+                on_result=self._open_edit_dialog
+            )
+
+    def search(self, text: str):
+        """Filter the products, which are all in memory, locally."""
+        self.proxy.search(text)
+
+    def load(self):
+        """Load the first page of products, then sync the rest."""
+        self.load_first_page(
+            get_products_page, self.load_products, self.refresh_products
+        )
 
     def refresh_products(self):
-        """Refresh the products table."""
-        products = get_products()
-        self.load_products(products)
+        """Refresh the products table with the changes since the last sync."""
+        self.sync_changes(['products'], self._apply_changes)
+
+    def _apply_changes(self, changes: Dict[str, Any], full: bool):
+        """Apply synced changes to the table."""
+        if full:
+            self.load_products(changes['products'])
+        else:
+            self.model.apply_changes(
+                changes['products'],
+                changes['deleted']['products']
+            )
+        self._show_data()
+
+    def _open_edit_dialog(self, product: Dict[str, Any]):
+        """Open the edit dialog for a loaded product."""
+        if 'id' not in product:
+            show_error(self, product.get('message', 'Product not found'))
+            return
+
+        dialog = AddProductDialog(self, product)
 
+        if dialog.exec() == AddProductDialog.DialogCode.Accepted:
+            try:
+                data = dialog.get_data()
+                self.request(
+                    update_product, product['id'], data,
+                    on_result=self._on_product_saved
+                )
+            except Exception as e:
+                show_error(self, str(e))
 
-class OrdersTab(QWidget):
+    def _on_product_saved(self, response: Dict[str, Any]):
+        """Refresh after a product was created or updated."""
+        if 'id' in response:
+            self.refresh_products()
+        else:
+            show_error(
+                self,
+                response.get('message', 'Unknown error')
+            )
+
+    def _on_product_deleted(self, response: Dict[str, Any]):
+        """Refresh after a product was deleted."""
+        if 'message' in response:
+            show_info(self, "Product deleted successfully")
+            self.refresh_products()
+        else:
+            show_error(self, response.get('message', 'Unknown error'))
+
+
+class OrdersTab(ApiTab):
     """Tab for managing orders."""
-    def __init__(self, orders: List[Dict[str, Any]]):
+    def __init__(self):
         """Initialize the orders tab."""
         super().__init__()
         self.setup_ui()
-        self.load_orders(orders)
 
     def setup_ui(self):
         """Setup the tab UI."""
@@ -192,6 +407,8 @@ class OrdersTab(QWidget):
         add_btn.clicked.connect(self.add_order)
         refresh_btn.clicked.connect(self.refresh_orders)
 
+        button_layout.addWidget(self.loading_bar)
+        button_layout.addWidget(self.search_input)
         button_layout.addWidget(add_btn)
         button_layout.addWidget(refresh_btn)
 
@@ -202,8 +419,14 @@ class OrdersTab(QWidget):
         layout.addLayout(header_layout)
 
         self.table = QTableView()
-        self.model = OrdersTableModel([])
-        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(
+            QTableView.SelectionBehavior.SelectRows
+        )
+        self.model = OrdersTableModel(get_orders_page)
+        self.model.error.connect(lambda message: show_error(self, message))
+        self.model.fetched.connect(self._show_data)
+        self.proxy = SearchProxyModel(self)
+        self.setup_table(self.model, self.proxy)
 
         self.action_delegate = ActionButtonDelegate(self.table, type="order")
         self.action_delegate.edit_clicked.connect(self.edit_order)
@@ -219,32 +442,24 @@ class OrdersTab(QWidget):
         layout.addWidget(self.table)
         self.setLayout(layout)
 
-    def load_orders(self, orders: List[Dict[str, Any]]):
-        """Load orders into the table."""
-        self.model = OrdersTableModel(orders)
-        self.table.setModel(self.model)
-
-        self.action_delegate = ActionButtonDelegate(self.table, type="order")
-        self.action_delegate.edit_clicked.connect(self.edit_order)
-        self.action_delegate.delete_clicked.connect(self.delete_order)
-        self.table.setItemDelegateForColumn(6, self.action_delegate)
+    def load_orders(self):
+        """Load orders into the table, page by page as it is scrolled."""
+        self.model.reload()
 
     def add_order(self):
         """Open dialog to add a new order."""
-        products = get_products()
-        dialog = AddOrderDialog(products, self)
+        dialog = AddOrderDialog(self)
         if dialog.exec() == AddOrderDialog.DialogCode.Accepted:
             try:
                 data = dialog.get_data()
-                response = create_order(data)
-                if 'id' in response:
-                    self.refresh_orders()
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "Error",
-                        response.get('message', 'Unknown error')
+                self.request(
+                    create_order, data,
+                    on_result=lambda response: self._on_order_saved(
+                        response, lambda message: QMessageBox.warning(
+                            self, "Error", message
+                        )
                     )
+                )
             except Exception as e:
                 QMessageBox.warning(self, "Error", str(e))
 
@@ -254,43 +469,131 @@ class OrdersTab(QWidget):
             self,
             "Are you sure you want to delete this order?"
         ):
-            try:
-                response = delete_order(order_id)
-                if 'message' in response:
-                    show_info(self, "Order deleted successfully")
-                    self.refresh_orders()
-                else:
-                    show_error(self, response.get('message', 'Unknown error'))
-            except Exception as e:
-                show_error(self, str(e))
+            self.request(
+                delete_order, order_id,
+                on_result=self._on_order_deleted
+            )
 
     def edit_order(self, order_id: int):
         """Open dialog to edit a product."""
-        orders = get_orders()
-        products = get_products()
-        order = next((o for o in orders if o['id'] == order_id), None)
-        if order:
-            dialog = AddOrderDialog(products, self)
-
-            dialog.quantity_input.setText(str(order['quantity']))
-            dialog.customer_input.setText(order['customer'])
-            dialog.date_input.setText(order['order_date'])
-
-            if dialog.exec() == AddOrderDialog.DialogCode.Accepted:
-                try:
-                    data = dialog.get_data()
-                    response = update_order(order_id, data)
-                    if 'id' in response:
-                        self.refresh_orders()
-                    else:
-                        show_error(
-                            self,
-                            response.get('message', 'Unknown error')
-                        )
-                except Exception as e:
-                    show_error(self, str(e))
+        # The clicked order is shown, so its page is normally in memory.
+        order = self.model.find(order_id)
+        if order is not None:
+            self._open_edit_dialog(order)
+        else:
+            self.request(
+                get_order, order_id,
+                on_result=self._open_edit_dialog
+            )
+
+    def search(self, text: str):
+        """
+        Filter the orders.
+
+        While all orders are in memory they are filtered locally. Beyond
+        that, the server searches them and the matches are paged in.
+        """
+        if self.model.is_complete():
+            self.proxy.search(text)
+        else:
+            self.proxy.search("")
+            self.model.set_search(text)
+
+    def load(self):
+        """Load the orders, see refresh_orders()."""
+        self.refresh_orders()
 
     def refresh_orders(self):
-        """Refresh the orders table."""
-        orders = get_orders()
-        self.load_orders(orders)
+        """
+        Refresh the orders table with the changes since the last sync.
+
+        Initially, and when the server does not know the revision, the
+        orders are not synced in full. Only the current revision is read,
+        and the orders are fetched page by page from there on.
+        """
+        # Orders embed their product, so product changes are synced too.
+        self.sync_changes(
+            ['products', 'orders'], self._apply_changes, full_tables=[]
+        )
+
+    def _apply_changes(self, changes: Dict[str, Any], full: bool):
+        """Apply synced changes to the table."""
+        if full:
+            self.load_orders()
+        else:
+            self.model.apply_changes(
+                changes['orders'],
+                changes['deleted']['orders'],
+                changes['products']
+            )
+
+    def _open_edit_dialog(self, order: Dict[str, Any]):
+        """Open the edit dialog for a loaded order."""
+        if 'id' not in order:
+            show_error(self, order.get('message', 'Order not found'))
+            return
+
+        order_id = order['id']
+        dialog = AddOrderDialog(self, order)
+
+        if dialog.exec() == AddOrderDialog.DialogCode.Accepted:
+            try:
+                data = dialog.get_data()
+                self.request(
+                    update_order, order_id, data,
+                    on_result=lambda response: self._on_order_saved(
+                        response, lambda message: show_error(self, message)
+                    )
+                )
+            except Exception as e:
+                show_error(self, str(e))
+
+    def _on_order_saved(
+        self,
+        response: Dict[str, Any],
+        show_failure: Callable[[str], Any]
+    ):
+        """Refresh after an order was created or updated."""
+        if 'id' in response:
+            self.refresh_orders()
+        else:
+            show_failure(response.get('message', 'Unknown error'))
+
+    def _on_order_deleted(self, response: Dict[str, Any]):
+        """Refresh after an order was deleted."""
+        if 'message' in response:
+            show_info(self, "Order deleted successfully")
+            self.refresh_orders()
+        else:
+            show_error(self, response.get('message', 'Unknown error'))
+
+def _sync_changes(
+    revision: int,
+    tables: List[str],
+    full_tables: List[str]
+) -> Dict[str, Any]:
+    """
+    Get the changes since a revision, run in the background.
+
+    If the server does not know the revision, e.g. because its database
+    was replaced, ``full_tables`` are fetched in full again. The returned
+    changes are flagged as a ``full`` snapshot in that case and when
+    starting from 0. Without ``full_tables``, a full snapshot only holds
+    the current revision.
+
+    Raises:
+        RuntimeError: If the sync failed.
+    """
+    def snapshot() -> Dict[str, Any]:
+        return sync(0, full_tables) if full_tables else get_revision()
+
+    changes = sync(revision, tables) if revision else snapshot()
+    if 'revision' not in changes and revision:
+        revision = 0
+        changes = snapshot()
+
+    if 'revision' not in changes:
+        raise RuntimeError(changes.get('message', 'Unknown error'))
+
+    changes['full'] = not revision
+    return changes
@@ -0,0 +1,97 @@
+from typing import Any, Callable, Optional, Set
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool
+from PyQt6.QtCore import pyqtSignal as Signal
+
+
+class RequestSignals(QObject):
+    """Signals of a background request, delivered on the GUI thread."""
+    result = Signal(object)
+    error = Signal(str)
+    finished = Signal()
+
+
+class ApiRequest(QRunnable):
+    """
+    API call running on the global QThreadPool.
+
+    The call itself cannot be interrupted, so a cancelled request runs to
+    its end, but its result and error are dropped instead of being
+    delivered.
+    """
+    def __init__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any):
+        super().__init__()
+        # Deleted by Python once finished, see run_request().
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self.signals = RequestSignals()
+
+    def run(self):
+        """Run the call and report its outcome."""
+        try:
+            try:
+                result = self.fn(*self.args, **self.kwargs)
+            except Exception as e:
+                self.signals.error.emit(str(e))
+            else:
+                self.signals.result.emit(result)
+            finally:
+                self.signals.finished.emit()
+        except RuntimeError:
+            # The signals were deleted because the application quit while
+            # the call was running, so there is no one left to tell.
+            pass
+
+    def cancel(self):
+        """Drop the outcome of the request."""
+        self.cancelled = True
+
+
+# Requests that have not finished yet. Holding them keeps their signals
+# alive until the outcome has been delivered.
+_running: Set[ApiRequest] = set()
+
+def run_request(
+    fn: Callable[..., Any],
+    *args: Any,
+    on_result: Callable[[Any], None],
+    on_error: Optional[Callable[[str], None]] = None,
+    on_finished: Optional[Callable[[], None]] = None,
+    **kwargs: Any
+) -> ApiRequest:
+    """
+    Run an API call in the background.
+
+    The callbacks run on the GUI thread. ``on_result`` and ``on_error`` are
+    skipped once the request is cancelled, ``on_finished`` always runs.
+
+    Args:
+        fn (callable): API function to call with ``args`` and ``kwargs``.
+        on_result (callable): Called with the return value of ``fn``.
+        on_error (callable): Called with the message if ``fn`` raised.
+        on_finished (callable): Called after the request ended either way.
+
+    Returns:
+        ApiRequest: The started request, which can be cancelled.
+    """
+    request = ApiRequest(fn, *args, **kwargs)
+
+    # The signals are emitted on a pool thread and queued to the GUI
+    # thread, so check for cancellation where the callbacks run.
+    request.signals.result.connect(
+        lambda result: None if request.cancelled else on_result(result)
+    )
+    if on_error is not None:
+        request.signals.error.connect(
+            lambda message: None if request.cancelled else on_error(message)
+        )
+    if on_finished is not None:
+        request.signals.finished.connect(on_finished)
+    request.signals.finished.connect(lambda: _running.discard(request))
+
+    _running.add(request)
+    QThreadPool.globalInstance().start(request)
+    return request